@@ -10,12 +10,27 @@ then prepends our custom routes for protocol discovery, backup, and restore.
 import os
 import sys
 import hmac
+import sqlite3
+import tempfile
+from typing import Optional
 
-from starlette.middleware import Middleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.requests import Request
 from starlette.responses import Response, JSONResponse, FileResponse
 from starlette.routing import Route
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    # python-multipart < 0.0.13 ships under the old module name
+    from multipart.multipart import MultipartParser, parse_options_header
 
 # ---------------------------------------------------------------------------
 # 1. Import the existing MCP server instance
@@ -24,6 +39,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import fitness_mcp as _fm  # noqa: E402
 mcp = _fm.mcp
 
+# No browser here, and the OAuth flow's loopback redirect is unreachable from
+# the client, so the interactive setup tool would just hang. Drop it from the
+# tool list where the SDK allows, and make it refuse either way.
+_fm.INTERACTIVE_OAUTH = False
+if hasattr(mcp, "remove_tool"):
+    mcp.remove_tool("fitness_setup_oauth")
+
 
 # ---------------------------------------------------------------------------
 # 2. Configuration
@@ -31,100 +53,345 @@ mcp = _fm.mcp
 PORT = int(os.environ.get("PORT", 8000))
 HOST = os.environ.get("HOST", "0.0.0.0")
 AUTH_TOKEN = os.environ.get("MCP_AUTH_TOKEN", "")
+DB_PATH = os.environ.get("DB_PATH", _fm.DB_PATH)
+# Same variable the uvicorn CLI reads for --workers. Defaults to 1 because
+# the MCP session manager keeps Streamable HTTP sessions in process memory:
+# with several workers a session's follow-up requests can land on a worker
+# that has never seen it. Raise it only behind a sticky load balancer.
+WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+# Every SQLite database file starts with these 16 bytes
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# /backup copies this many DB pages per backup step; the source lock is
+# released between steps so MCP writes can interleave with a long backup
+BACKUP_PAGES_PER_STEP = 256
+
+# Responses smaller than this aren't worth compressing. Level 5 gets most of
+# gzip's ratio on repetitive JSON at a fraction of the default level 9's CPU.
+GZIP_MINIMUM_SIZE = 512
+GZIP_LEVEL = 5
+
+
+if orjson is not None:
+    class FastJSONResponse(JSONResponse):
+        """JSONResponse rendered by orjson, which serializes in C straight to bytes."""
+
+        def render(self, content) -> bytes:
+            return orjson.dumps(content)
+else:
+    FastJSONResponse = JSONResponse
 
 
 # ---------------------------------------------------------------------------
-# 3. Auth middleware — only gates /backup and /restore
+# 3. Middleware — path rewrite, auth (gates /backup and /restore), gzip
 # ---------------------------------------------------------------------------
-PROTECTED_PATHS = {"/backup", "/restore"}
+PROTECTED_PATHS = frozenset({"/backup", "/restore"})
 
 
-class PathRewriteMiddleware(BaseHTTPMiddleware):
+class PathRewriteMiddleware:
     """Rewrite POST/GET/DELETE on / to /mcp.
     Claude's Custom Connector POSTs to root, but the MCP SDK serves at /mcp.
-    HEAD stays at / for our protocol-discovery handler."""
+    HEAD stays at / for our protocol-discovery handler.
+
+    Plain ASGI rather than BaseHTTPMiddleware: every MCP RPC passes through
+    here, and BaseHTTPMiddleware adds a task group and memory streams to
+    each request just to change one scope key."""
+
+    REWRITE_METHODS = frozenset({"POST", "GET", "DELETE"})
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] == "http"
+            and scope["path"] == "/"
+            and scope["method"] in self.REWRITE_METHODS
+        ):
+            scope = {**scope, "path": "/mcp", "raw_path": b"/mcp"}
+        await self.app(scope, receive, send)
+
+
+class BearerAuthMiddleware:
+    """Reject requests to PROTECTED_PATHS without the bearer token.
+
+    Reads the header straight from the ASGI scope so unprotected traffic
+    never builds a Request object."""
+
+    def __init__(self, app: ASGIApp, token: str):
+        self.app = app
+        # Precomputed once so each protected request is a single compare_digest
+        self.expected = f"Bearer {token}".encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] not in PROTECTED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        auth = b""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth = value
+                break
+        if not hmac.compare_digest(auth, self.expected):
+            response = FastJSONResponse(
+                {"error": "unauthorized"},
+                status_code=401,
+                headers={"WWW-Authenticate": 'Bearer realm="fitness-mcp"'},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
 
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path == "/" and request.method in ("POST", "GET", "DELETE"):
-            request.scope["path"] = "/mcp"
-        return await call_next(request)
+class SkipBackupGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves /backup alone.
 
+    SQLite pages barely compress, so gzipping a backup burns CPU for almost
+    no saving — and wrapping send would stop FileResponse using pathsend.
+    The /mcp SSE streams are skipped by GZipMiddleware itself, which needs
+    starlette 0.46+ (pinned in requirements-remote.txt).
+    """
 
-class BearerAuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if AUTH_TOKEN and request.url.path in PROTECTED_PATHS:
-            auth = request.headers.get("authorization", "")
-            expected = f"Bearer {AUTH_TOKEN}"
-            if not hmac.compare_digest(auth, expected):
-                return JSONResponse(
-                    {"error": "unauthorized"},
-                    status_code=401,
-                    headers={"WWW-Authenticate": 'Bearer realm="fitness-mcp"'},
-                )
-        return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] == "/backup":
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
 
 # ---------------------------------------------------------------------------
 # 4. Custom route handlers
 # ---------------------------------------------------------------------------
-async def head_root(request: Request) -> Response:
-    """Protocol discovery — Claude sends HEAD / to find the MCP version."""
-    return Response(
-        status_code=200,
-        headers={"MCP-Protocol-Version": "2025-06-18"},
-    )
+class DBUpload:
+    """Receive an uploaded DB into a temp file next to the live one.
+
+    With a boundary, the body is multipart/form-data: it is fed to
+    python-multipart's low-level parser as it arrives and only the "file"
+    part is kept. Without one, the body is the DB itself and is written
+    as-is. Either way nothing beyond the current chunk is held in memory,
+    and the temp file is only created once the first bytes have passed
+    the SQLite header check.
+    """
+
+    def __init__(self, db_dir: str, boundary: Optional[bytes] = None):
+        self.db_dir = db_dir
+        self.found = False      # saw a part named "file"
+        self.complete = False   # ...and its closing boundary
+        self.invalid = False    # ...but it isn't a SQLite DB
+        self.size = 0
+        self.path = None
+        self._tmp = None
+        self._head = b""
+        self._in_file = False
+        self._header_field = b""
+        self._header_value = b""
+        if boundary is None:
+            self._parser = None
+            self.found = self._in_file = True
+        else:
+            self._parser = MultipartParser(boundary, {
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            })
+
+    def feed(self, chunk: bytes):
+        if self._parser is None:
+            self._on_part_data(chunk, 0, len(chunk))
+        else:
+            self._parser.write(chunk)
+
+    def finish(self):
+        """Mark the end of the body. A raw upload is complete when it ends."""
+        if self._parser is None:
+            self.complete = True
+
+    def close(self):
+        if self._tmp is not None:
+            self._tmp.close()
+
+    def discard(self):
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            _, params = parse_options_header(self._header_value)
+            self._in_file = params.get(b"name") == b"file" and not self.found
+            self.found = self.found or self._in_file
+        self._header_field = self._header_value = b""
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if not self._in_file or self.invalid:
+            return
+        data = data[start:end]
+        if self._tmp is None:
+            # Hold bytes back until there are enough to check the header
+            self._head += data
+            if len(self._head) < len(SQLITE_HEADER):
+                return
+            if not self._head.startswith(SQLITE_HEADER):
+                self.invalid = True
+                return
+            tmp_fd, self.path = tempfile.mkstemp(suffix=".db", dir=self.db_dir)
+            self._tmp = os.fdopen(tmp_fd, "wb")
+            data, self._head = self._head, b""
+        self._tmp.write(data)
+        self.size += len(data)
+
+    def _on_part_end(self):
+        if self._in_file:
+            self.complete = True
+            self._in_file = False
+
+
+# Protocol discovery — Claude sends HEAD / to find the MCP version. The
+# answer never changes, so one Response is built (and its headers encoded)
+# at import and mounted directly as the route's ASGI app.
+head_root = Response(
+    status_code=200,
+    headers={"MCP-Protocol-Version": "2025-06-18"},
+)
+
+
+# Like head_root, a fixed reply built once and served as-is
+health = FastJSONResponse({"status": "ok"})
+
+
+def _snapshot_db(db_path: str) -> str:
+    """Copy the DB to a temp file with SQLite's backup API; return its path.
+
+    Serving the live file could hand out a torn page if a tool writes
+    mid-download, so /backup always serves a consistent snapshot instead.
+    """
+    snap_fd, snap_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(db_path))
+    os.close(snap_fd)
+    try:
+        src = sqlite3.connect(db_path)
+        dst = sqlite3.connect(snap_path)
+        try:
+            src.backup(dst, pages=BACKUP_PAGES_PER_STEP)
+        finally:
+            dst.close()
+            src.close()
+    except Exception:
+        os.unlink(snap_path)
+        raise
+    return snap_path
+
 
+class SnapshotFileResponse(FileResponse):
+    """FileResponse for a temporary snapshot — deletes it once sent.
 
-async def health(request: Request) -> Response:
-    return JSONResponse({"status": "ok"})
+    FileResponse hands the file to the server via the ASGI pathsend
+    extension (zero-copy) when the server supports it, and otherwise
+    streams it with a 256 KiB buffer instead of the default 64 KiB.
+    Cleanup runs in a finally so a dropped client can't leak the file.
+    """
+
+    chunk_size = 256 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            os.unlink(self.path)
 
 
 async def backup_db(request: Request) -> Response:
-    """GET /backup — download the SQLite DB file."""
-    db_path = os.environ.get("DB_PATH", _fm.DB_PATH)
-    if not os.path.exists(db_path):
-        return JSONResponse({"error": "database not found"}, status_code=404)
-    return FileResponse(
-        db_path, filename="fitness.db", media_type="application/x-sqlite3",
+    """GET /backup — download a consistent snapshot of the SQLite DB."""
+    if not os.path.exists(DB_PATH):
+        return FastJSONResponse({"error": "database not found"}, status_code=404)
+    snap_path = await run_in_threadpool(_snapshot_db, DB_PATH)
+    # Passing the stat result sets Content-Length (no chunked encoding)
+    # and saves FileResponse a second stat of its own.
+    return SnapshotFileResponse(
+        snap_path,
+        stat_result=os.stat(snap_path),
+        filename="fitness.db",
+        media_type="application/x-sqlite3",
     )
 
 
-async def restore_db(request: Request) -> Response:
-    """POST /restore — upload a SQLite DB to replace the current one."""
-    import shutil
-    import tempfile
+NO_FILE_ERROR = (
+    "no file provided — use: curl --data-binary @path/to/fitness.db "
+    "-H 'Content-Type: application/octet-stream'"
+)
 
-    db_path = os.environ.get("DB_PATH", _fm.DB_PATH)
+# Content types accepted as a bare DB body (no multipart wrapping)
+RAW_DB_CONTENT_TYPES = frozenset({
+    b"application/octet-stream",
+    b"application/x-sqlite3",
+    b"application/vnd.sqlite3",
+})
 
-    form = await request.form()
-    upload = form.get("file")
-    if upload is None:
-        return JSONResponse(
-            {"error": "no file provided — use: curl -F 'file=@path/to/fitness.db'"},
-            status_code=400,
-        )
 
-    tmp_fd, tmp_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(db_path))
+async def restore_db(request: Request) -> Response:
+    """POST /restore — upload a SQLite DB to replace the current one.
+
+    Send the file as the raw body:
+        curl --data-binary @fitness.db -H 'Content-Type: application/octet-stream'
+    `curl -F 'file=@fitness.db'` (multipart) is still accepted.
+    """
+    ctype, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if ctype in RAW_DB_CONTENT_TYPES:
+        boundary = None
+    elif ctype != b"multipart/form-data" or not boundary:
+        return FastJSONResponse({"error": NO_FILE_ERROR}, status_code=400)
+
+    upload = DBUpload(os.path.dirname(DB_PATH), boundary)
     try:
-        with os.fdopen(tmp_fd, "wb") as tmp:
-            contents = await upload.read()
-            tmp.write(contents)
-
-        if not contents[:16].startswith(b"SQLite format 3"):
-            os.unlink(tmp_path)
-            return JSONResponse(
+        try:
+            async for chunk in request.stream():
+                # Parsing and the disk write both run off the event loop
+                await run_in_threadpool(upload.feed, chunk)
+                if upload.invalid:
+                    break
+            upload.finish()
+        except ValueError:
+            # Malformed multipart body
+            return FastJSONResponse({"error": NO_FILE_ERROR}, status_code=400)
+        if not upload.found:
+            return FastJSONResponse({"error": NO_FILE_ERROR}, status_code=400)
+        if upload.invalid or upload.path is None:
+            return FastJSONResponse(
                 {"error": "uploaded file is not a valid SQLite database"},
                 status_code=400,
             )
-
-        shutil.move(tmp_path, db_path)
-    except Exception as e:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        return JSONResponse({"error": str(e)}, status_code=500)
-
-    size_kb = len(contents) / 1024
-    return JSONResponse({"status": "restored", "size_kb": round(size_kb, 1)})
+        if not upload.complete:
+            return FastJSONResponse({"error": "upload was truncated"}, status_code=400)
+        upload.close()
+
+        try:
+            # Same directory, so this is a single atomic rename(2) — shutil.move
+            # could fall back to copying the whole file.
+            assert os.path.dirname(upload.path) == os.path.dirname(DB_PATH)
+            # Waits for in-flight DB work, closes the pool, drops the WAL
+            # sidecars and renames the upload into place without letting
+            # any thread reopen the old file
+            await run_in_threadpool(_fm.replace_db, upload.path)
+            # Older backups may predate the current schema version
+            await run_in_threadpool(_fm.init_db)
+        except Exception as e:
+            return FastJSONResponse({"error": str(e)}, status_code=500)
+    finally:
+        # No-op once the temp file has been renamed into place
+        upload.discard()
+
+    size_kb = upload.size / 1024
+    return FastJSONResponse({"status": "restored", "size_kb": round(size_kb, 1)})
 
 
 # ---------------------------------------------------------------------------
@@ -150,9 +417,13 @@ for route in reversed([
 ]):
     app.router.routes.insert(0, route)
 
-# Middleware (Starlette runs last-added first)
+# Middleware (Starlette runs last-added first). GZip goes innermost so it
+# sees the rewritten /mcp path and only compresses real responses.
+app.add_middleware(
+    SkipBackupGZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_LEVEL,
+)
 if AUTH_TOKEN:
-    app.add_middleware(BearerAuthMiddleware)
+    app.add_middleware(BearerAuthMiddleware, token=AUTH_TOKEN)
 app.add_middleware(PathRewriteMiddleware)
 
 
@@ -163,4 +434,18 @@ if __name__ == "__main__":
     import uvicorn
     print(f"Starting fitness-mcp HTTP server on {HOST}:{PORT}")
     print(f"Auth: {'bearer token' if AUTH_TOKEN else 'authless'}")
-    uvicorn.run(app, host=HOST, port=PORT)
+    print(f"Workers: {WORKERS}")
+    # uvicorn needs an import string to spawn worker processes. loop/http
+    # stay on "auto", which picks uvloop and httptools when installed but
+    # still runs on platforms without them (uvloop has no Windows build).
+    uvicorn.run(
+        app if WORKERS == 1 else "deploy.server:app",
+        host=HOST,
+        port=PORT,
+        workers=WORKERS,
+        loop="auto",
+        http="auto",
+        access_log=False,
+        server_header=False,
+        date_header=False,
+    )
@@ -14,7 +14,15 @@ echo "PORT     = ${PORT:-8000}"
 echo "AUTH     = $([ -n "$MCP_AUTH_TOKEN" ] && echo 'bearer-token' || echo 'authless')"
 
 # ── Start the HTTP server ────────────────────────────────────────────
+# uvloop/httptools come with uvicorn[standard]; naming them makes a broken
+# install fail at startup instead of silently falling back to asyncio/h11.
+# No access log: every MCP tool call would otherwise write a log line.
 exec uvicorn deploy.server:app \
     --host "${HOST:-0.0.0.0}" \
     --port "${PORT:-8000}" \
+    --loop uvloop \
+    --http httptools \
+    --no-access-log \
+    --no-server-header \
+    --no-date-header \
     --log-level info
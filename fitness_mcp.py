@@ -6,30 +6,44 @@ A local MCP server for tracking workouts, nutrition, body metrics, and training
 Designed to help coach users toward their fitness goals with data-driven insights.
 """
 
+import asyncio
+import base64
+import hashlib
+import importlib.util
 import json
+import logging
 import sqlite3
 import os
-from datetime import datetime, timedelta, date
-from typing import Optional, List, Dict, Any
+import threading
+from datetime import datetime, timedelta, date, time
+from typing import Annotated, Optional, List, Dict, Any
 from enum import Enum
 from pathlib import Path
 from contextlib import contextmanager
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from itertools import combinations
+from operator import itemgetter
 import csv
+import random
 import re
 
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict, StringConstraints
 
-# Google Calendar imports (optional - graceful fallback if not installed)
+# Google Calendar libraries (optional - graceful fallback if not installed).
+# Only checked for here; they are imported on first calendar use, so
+# starting the server doesn't pay for loading google-auth and the API client.
 try:
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-    GOOGLE_CALENDAR_AVAILABLE = True
+    GOOGLE_CALENDAR_AVAILABLE = all(
+        importlib.util.find_spec(name) is not None
+        for name in ("google.auth", "google.oauth2", "google_auth_oauthlib", "googleapiclient")
+    )
 except ImportError:
     GOOGLE_CALENDAR_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 # Initialize the MCP server
 # When MCP_ALLOWED_HOST is set (production deploy behind a proxy), configure
 # transport security to accept that hostname. Without this, the SDK's DNS
@@ -55,156 +69,471 @@ else:
 # persistent volume at /data), otherwise default to local home directory.
 DB_PATH = os.environ.get("DB_PATH", os.path.expanduser("~/.fitness_tracker/fitness.db"))
 
+# SQLite journal mode. WAL by default; SQLITE_JOURNAL_MODE overrides it for
+# filesystems where WAL's shared-memory file doesn't work (e.g. some
+# network mounts).
+JOURNAL_MODE = (os.environ.get("SQLITE_JOURNAL_MODE") or "WAL").upper()
+if JOURNAL_MODE not in {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}:
+    raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE: {JOURNAL_MODE}")
+
 
 # ============================================================================
 # Database Setup
 # ============================================================================
 
+_DB_DIR_READY = False
+
+
 def get_db_path() -> str:
-    """Get the database path, creating directory if needed."""
-    db_dir = os.path.dirname(DB_PATH)
-    if not os.path.exists(db_dir):
-        os.makedirs(db_dir)
+    """Get the database path, creating directory if needed (once per process)."""
+    global _DB_DIR_READY
+    if not _DB_DIR_READY:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        _DB_DIR_READY = True
     return DB_PATH
 
 
+# Memory-map up to 256 MiB of the DB file; page cache of ~20 MB
+# (negative cache_size is in KiB)
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE = -20000
+# Prepared statements kept per connection, keyed by SQL text. Room for every
+# distinct query in this module, so with pooled connections each one is
+# parsed and planned once per thread rather than on every tool call.
+STATEMENT_CACHE_SIZE = 256
+
+# One connection per thread, reused across tool calls. Opening a connection
+# for every call costs a connect plus a schema parse on first query.
+_tls = threading.local()
+_pool_lock = threading.Lock()
+_pool: List[sqlite3.Connection] = []
+# Bumped by close_connections(); a thread whose cached connection is from an
+# older generation opens a fresh one.
+_pool_generation = 0
+# get_db() blocks in progress, and whether close_connections()/replace_db()
+# is waiting for them to finish before closing the pool. New blocks wait
+# while it is, so a steady stream of tool calls can't starve a restore.
+_pool_cond = threading.Condition()
+_pool_users = 0
+_pool_closing = False
+
+
+def get_conn() -> sqlite3.Connection:
+    """Return this thread's pooled connection, opening it on first use."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None or _tls.generation != _pool_generation:
+        # Opened under the pool lock so replace_db() can't swap the file
+        # between this connect and tagging it with the current generation
+        with _pool_lock:
+            conn = sqlite3.connect(
+                get_db_path(), check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            # Per-connection tuning, once per thread (journal_mode is set in
+            # init_db). In WAL mode NORMAL is durable except across a power
+            # loss, which may drop the last few commits but never corrupts the DB.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            conn.execute(f"PRAGMA cache_size={CACHE_SIZE}")
+            _pool.append(conn)
+            _tls.conn = conn
+            _tls.generation = _pool_generation
+    return conn
+
+
 @contextmanager
-def get_db():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
+def _pool_in_use():
+    """Keep the pool open until the block exits. Re-entrant per thread."""
+    global _pool_users
+    depth = getattr(_tls, "depth", 0)
+    if not depth:
+        with _pool_cond:
+            _pool_cond.wait_for(lambda: not _pool_closing)
+            _pool_users += 1
+    _tls.depth = depth + 1
     try:
-        yield conn
+        yield
+    finally:
+        _tls.depth = depth
+        if not depth:
+            with _pool_cond:
+                _pool_users -= 1
+                _pool_cond.notify_all()
+
+
+@contextmanager
+def _pool_closed():
+    """Wait out every _pool_in_use() block, then close the pool.
+
+    The body runs with _pool_lock held and no connection in use, so it can
+    swap the DB file before anyone reconnects.
+    """
+    global _pool_closing, _pool_generation, _data_generation
+    if getattr(_tls, "depth", 0):
+        raise RuntimeError("can't close the connection pool inside get_db()")
+    with _pool_cond:
+        _pool_cond.wait_for(lambda: not _pool_closing)
+        _pool_closing = True
+        _pool_cond.wait_for(lambda: _pool_users == 0)
+    try:
+        with _pool_lock:
+            _pool_generation += 1
+            _data_generation += 1
+            for conn in _pool:
+                conn.close()
+            _pool.clear()
+            yield
+    finally:
+        with _pool_cond:
+            _pool_closing = False
+            _pool_cond.notify_all()
+
+
+def close_connections():
+    """Close every pooled connection, once no get_db() block is using one.
+
+    Threads open a fresh connection on their next get_conn(). To swap the
+    DB file itself, use replace_db() instead.
+    """
+    with _pool_closed():
+        pass
+
+
+def replace_db(new_path: str) -> None:
+    """Replace the DB file with new_path (same directory) and drop the pool.
+
+    Waits for in-flight get_db() blocks (an import, say) to finish, and
+    holds the pool lock from closing the old connections until the new
+    file is in place, so no thread can open a connection to the old file
+    in between. Closing the connections also checkpoints the WAL; the
+    -wal/-shm sidecars are then removed so they can't be replayed on top
+    of the new file.
+    """
+    with _pool_closed():
+        for suffix in ("-wal", "-shm"):
+            try:
+                os.unlink(DB_PATH + suffix)
+            except FileNotFoundError:
+                pass
+        os.replace(new_path, DB_PATH)
+
+
+@contextmanager
+def get_db():
+    """Context manager for database access on the pooled connection.
+
+    Commits on success and rolls back on error; the connection stays open.
+    """
+    global _data_generation
+    with _pool_in_use():
+        conn = get_conn()
+        changes = conn.total_changes
+        try:
+            yield conn
+        except BaseException:
+            # A failed rollback must not replace the error being raised
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            raise
         conn.commit()
+        if conn.total_changes != changes:
+            _data_generation += 1
+
+
+# Rendered output of the read-only tools, keyed on the tool, its params,
+# today's date (most of them look back from today) and data_version().
+READ_CACHE_SIZE = 128
+_read_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_read_cache_lock = threading.Lock()
+# Bumped whenever a get_db() block changes rows, and by close_connections().
+_data_generation = 0
+
+
+def data_version() -> tuple:
+    """Return a marker that changes whenever the DB contents may have changed.
+
+    _data_generation covers writes made through this process. SQLite's
+    data_version pragma covers commits from any other connection, including
+    other workers, but is only comparable on the connection that read it.
+    """
+    with _pool_in_use():
+        conn = get_conn()
+        return _data_generation, id(conn), conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def cached_read(fn):
+    """Memoize a read-only tool's output until the DB or the date changes."""
+    @wraps(fn)
+    async def wrapper(params):
+        key = (fn.__name__, params.model_dump_json(), date.today().isoformat(), data_version())
+        with _read_cache_lock:
+            result = _read_cache.get(key)
+            if result is not None:
+                _read_cache.move_to_end(key)
+                return result
+        result = await fn(params)
+        with _read_cache_lock:
+            _read_cache[key] = result
+            if len(_read_cache) > READ_CACHE_SIZE:
+                _read_cache.popitem(last=False)
+        return result
+    return wrapper
+
+
+# Bump SCHEMA_VERSION whenever SCHEMA_SQL changes. Every statement in it is
+# idempotent, so re-running the whole script is the migration.
+SCHEMA_VERSION = 6
+
+SCHEMA_SQL = """
+-- Workouts table - stores both SugarWOD imports and manual entries
+CREATE TABLE IF NOT EXISTS workouts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    score_type TEXT,
+    result_raw INTEGER,
+    result_display TEXT,
+    barbell_lift TEXT,
+    set_details TEXT,
+    notes TEXT,
+    rx_or_scaled TEXT,
+    is_pr BOOLEAN DEFAULT FALSE,
+    source TEXT DEFAULT 'manual',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(date, title, result_display)
+);
+
+-- Lift PRs table - tracks personal records for each lift
+CREATE TABLE IF NOT EXISTS lift_prs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lift_name TEXT NOT NULL,
+    weight REAL NOT NULL,
+    reps INTEGER DEFAULT 1,
+    date DATE NOT NULL,
+    workout_id INTEGER,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (workout_id) REFERENCES workouts(id)
+);
+
+-- Daily protein log
+CREATE TABLE IF NOT EXISTS protein_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL UNIQUE,
+    grams INTEGER NOT NULL,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Body weight log
+CREATE TABLE IF NOT EXISTS weight_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL UNIQUE,
+    weight REAL NOT NULL,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Readiness check-ins
+CREATE TABLE IF NOT EXISTS readiness_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL UNIQUE,
+    sleep_quality INTEGER CHECK(sleep_quality BETWEEN 1 AND 5),
+    energy INTEGER CHECK(energy BETWEEN 1 AND 5),
+    soreness INTEGER CHECK(soreness BETWEEN 1 AND 5),
+    stress INTEGER CHECK(stress BETWEEN 1 AND 5),
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Goals table
+CREATE TABLE IF NOT EXISTS goals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    target_value REAL,
+    target_date DATE,
+    achieved BOOLEAN DEFAULT FALSE,
+    achieved_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Programs table - training blocks
+CREATE TABLE IF NOT EXISTS programs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    start_date DATE NOT NULL,
+    end_date DATE,
+    is_active BOOLEAN DEFAULT TRUE,
+    program_data TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Mobility log
+CREATE TABLE IF NOT EXISTS mobility_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    focus_area TEXT,
+    exercises TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes. The workouts UNIQUE constraint already indexes
+-- (date, title, result_display) for the import's duplicate check, and the
+-- UNIQUE date columns on protein_log/weight_log/readiness_log get their own
+-- automatic indexes (which the ON CONFLICT(date) upserts use).
+-- Ordered by (date, rowid): serves "ORDER BY date DESC, id DESC" without a sort
+CREATE INDEX IF NOT EXISTS idx_workouts_date ON workouts(date);
+-- Covering index: MAX(weight) per lift/reps is read straight from it
+CREATE INDEX IF NOT EXISTS idx_lift_prs_name_reps ON lift_prs(lift_name, reps, weight DESC);
+-- Covering index in the PR board's window order, so it needs no sort
+CREATE INDEX IF NOT EXISTS idx_lift_prs_best ON lift_prs(lift_name, weight DESC, date);
+-- Weekly review's "new PRs in this window" range scan
+CREATE INDEX IF NOT EXISTS idx_lift_prs_date ON lift_prs(date);
+-- Weekly mobility totals filter on date >= ?
+CREATE INDEX IF NOT EXISTS idx_mobility_date ON mobility_log(date);
+-- Active program lookup: WHERE is_active ORDER BY start_date DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_programs_active ON programs(is_active, start_date DESC);
+"""
+
+# Trigram full-text indexes over the lift name columns. Lift history
+# searches with LIKE '%name%', which no b-tree index can serve; FTS5's
+# trigram tokenizer answers the same LIKE from its index instead of
+# scanning every row. External content, kept in sync by triggers, so the
+# text isn't stored twice. 'rebuild' backfills rows that predate the index.
+# Needs SQLite 3.34+ built with FTS5; see TRIGRAM_FTS.
+LIFT_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS workouts_lift_fts USING fts5(
+    barbell_lift, content='workouts', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS workouts_lift_fts_ai AFTER INSERT ON workouts BEGIN
+    INSERT INTO workouts_lift_fts(rowid, barbell_lift) VALUES (new.id, new.barbell_lift);
+END;
+CREATE TRIGGER IF NOT EXISTS workouts_lift_fts_ad AFTER DELETE ON workouts BEGIN
+    INSERT INTO workouts_lift_fts(workouts_lift_fts, rowid, barbell_lift)
+    VALUES ('delete', old.id, old.barbell_lift);
+END;
+CREATE TRIGGER IF NOT EXISTS workouts_lift_fts_au AFTER UPDATE OF barbell_lift ON workouts BEGIN
+    INSERT INTO workouts_lift_fts(workouts_lift_fts, rowid, barbell_lift)
+    VALUES ('delete', old.id, old.barbell_lift);
+    INSERT INTO workouts_lift_fts(rowid, barbell_lift) VALUES (new.id, new.barbell_lift);
+END;
+INSERT INTO workouts_lift_fts(workouts_lift_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS lift_prs_fts USING fts5(
+    lift_name, content='lift_prs', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS lift_prs_fts_ai AFTER INSERT ON lift_prs BEGIN
+    INSERT INTO lift_prs_fts(rowid, lift_name) VALUES (new.id, new.lift_name);
+END;
+CREATE TRIGGER IF NOT EXISTS lift_prs_fts_ad AFTER DELETE ON lift_prs BEGIN
+    INSERT INTO lift_prs_fts(lift_prs_fts, rowid, lift_name)
+    VALUES ('delete', old.id, old.lift_name);
+END;
+CREATE TRIGGER IF NOT EXISTS lift_prs_fts_au AFTER UPDATE OF lift_name ON lift_prs BEGIN
+    INSERT INTO lift_prs_fts(lift_prs_fts, rowid, lift_name)
+    VALUES ('delete', old.id, old.lift_name);
+    INSERT INTO lift_prs_fts(rowid, lift_name) VALUES (new.id, new.lift_name);
+END;
+INSERT INTO lift_prs_fts(lift_prs_fts) VALUES ('rebuild');
+"""
+
+# Without trigram support the triggers have to go: left behind by a build
+# that had it, they would fail every write to workouts and lift_prs.
+LIFT_FTS_DROP_SQL = """
+DROP TRIGGER IF EXISTS workouts_lift_fts_ai;
+DROP TRIGGER IF EXISTS workouts_lift_fts_ad;
+DROP TRIGGER IF EXISTS workouts_lift_fts_au;
+DROP TRIGGER IF EXISTS lift_prs_fts_ai;
+DROP TRIGGER IF EXISTS lift_prs_fts_ad;
+DROP TRIGGER IF EXISTS lift_prs_fts_au;
+"""
+
+
+def _has_trigram_fts() -> bool:
+    """Whether this SQLite build has FTS5 with the trigram tokenizer (3.34+)."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
     finally:
         conn.close()
 
 
+# Lift history uses the trigram indexes when they can be created and falls
+# back to a plain LIKE scan (same results, just slower) when they can't.
+TRIGRAM_FTS = _has_trigram_fts()
+
+
 def init_db():
-    """Initialize the database schema."""
+    """Initialize the database schema.
+
+    Runs at import, so it returns after two PRAGMAs when the DB is already
+    at SCHEMA_VERSION.
+    """
     with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Workouts table - stores both SugarWOD imports and manual entries
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS workouts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                score_type TEXT,
-                result_raw INTEGER,
-                result_display TEXT,
-                barbell_lift TEXT,
-                set_details TEXT,
-                notes TEXT,
-                rx_or_scaled TEXT,
-                is_pr BOOLEAN DEFAULT FALSE,
-                source TEXT DEFAULT 'manual',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(date, title, result_display)
-            )
-        """)
-        
-        # Lift PRs table - tracks personal records for each lift
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS lift_prs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                lift_name TEXT NOT NULL,
-                weight REAL NOT NULL,
-                reps INTEGER DEFAULT 1,
-                date DATE NOT NULL,
-                workout_id INTEGER,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (workout_id) REFERENCES workouts(id)
-            )
-        """)
-        
-        # Daily protein log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS protein_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL UNIQUE,
-                grams INTEGER NOT NULL,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Body weight log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS weight_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL UNIQUE,
-                weight REAL NOT NULL,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Readiness check-ins
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS readiness_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL UNIQUE,
-                sleep_quality INTEGER CHECK(sleep_quality BETWEEN 1 AND 5),
-                energy INTEGER CHECK(energy BETWEEN 1 AND 5),
-                soreness INTEGER CHECK(soreness BETWEEN 1 AND 5),
-                stress INTEGER CHECK(stress BETWEEN 1 AND 5),
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Goals table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category TEXT NOT NULL,
-                description TEXT NOT NULL,
-                target_value REAL,
-                target_date DATE,
-                achieved BOOLEAN DEFAULT FALSE,
-                achieved_date DATE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Programs table - training blocks
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS programs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                start_date DATE NOT NULL,
-                end_date DATE,
-                is_active BOOLEAN DEFAULT TRUE,
-                program_data TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Mobility log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS mobility_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL,
-                duration_minutes INTEGER NOT NULL,
-                focus_area TEXT,
-                exercises TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
+        # WAL lets reads proceed while a tool is writing and turns each
+        # commit into one append instead of a journal write + fsync. The
+        # mode is stored in the DB file; it's set on every init (not just
+        # with the schema) so a restored DB is switched over as well.
+        conn.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+        # Also re-run when the FTS triggers don't match this build's
+        # TRIGRAM_FTS, e.g. a DB restored from a host with a newer SQLite.
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'workouts_lift_fts_ai'"
+        ).fetchone() is not None
+        if (conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION
+                and has_fts == TRIGRAM_FTS):
+            return
+
+        fts_sql = LIFT_FTS_SQL if TRIGRAM_FTS else LIFT_FTS_DROP_SQL
+        conn.executescript(
+            f"BEGIN; {SCHEMA_SQL} {fts_sql} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;"
+        )
 
 
 # Initialize database on module load
 init_db()
 
 
+def update_sql_by_shape(
+    table: str, key_column: str, columns, returning: str
+) -> Dict[tuple, str]:
+    """Prebuild "UPDATE ... SET ... WHERE key = ? RETURNING ..." for every
+    non-empty subset of columns, keyed by the subset as an ordered tuple.
+
+    Partial-update tools look their statement up instead of assembling SQL
+    on each call, and each shape's SQL text is stable for the statement cache.
+    """
+    shapes = {}
+    for n in range(1, len(columns) + 1):
+        for subset in combinations(columns, n):
+            assignments = ", ".join(f"{column} = ?" for column in subset)
+            shapes[subset] = (
+                f"UPDATE {table} SET {assignments} WHERE {key_column} = ? RETURNING {returning}"
+            )
+    return shapes
+
+
+def json_rows_sql(select_sql: str, columns) -> str:
+    """Wrap a SELECT so SQLite returns its rows as one JSON array of objects.
+
+    columns names the SELECT's output columns; they become the object keys.
+    Row order is the inner query's ORDER BY.
+    """
+    pairs = ", ".join(f"'{column}', {column}" for column in columns)
+    return f"SELECT json_group_array(json_object({pairs})) FROM ({select_sql})"
+
+
 # ============================================================================
 # Enums and Input Models
 # ============================================================================
@@ -214,6 +543,14 @@ class ResponseFormat(str, Enum):
     JSON = "json"
 
 
+# For models that strip only their free-text fields rather than setting
+# str_strip_whitespace: dates are matched exactly instead of trimmed.
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+ISO_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+# A sanity check, not RFC 5322: catches typos before any Calendar call
+EmailAddress = Annotated[str, StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")]
+
+
 class ScoreType(str, Enum):
     TIME = "time"
     REPS = "reps"
@@ -234,8 +571,12 @@ class ImportSugarWODInput(BaseModel):
     file_path: str = Field(..., description="Path to the SugarWOD CSV export file")
 
 
+@lru_cache(maxsize=4096)
 def parse_sugarwod_date(date_str: str) -> str:
-    """Parse SugarWOD date format (MM/DD/YYYY) to ISO format."""
+    """Parse SugarWOD date format (MM/DD/YYYY) to ISO format.
+
+    Cached: an export has many rows per day, and strptime is slow.
+    """
     try:
         dt = datetime.strptime(date_str, "%m/%d/%Y")
         return dt.strftime("%Y-%m-%d")
@@ -243,30 +584,33 @@ def parse_sugarwod_date(date_str: str) -> str:
         return date_str
 
 
-@mcp.tool(
-    name="fitness_import_sugarwod",
-    annotations={
-        "title": "Import SugarWOD Export",
-        "readOnlyHint": False,
-        "destructiveHint": False,
-        "idempotentHint": True,
-        "openWorldHint": False
-    }
+# CSV columns the import reads, in the order the loop unpacks them
+SUGARWOD_COLUMNS = (
+    'date', 'title', 'description', 'score_type', 'best_result_raw',
+    'best_result_display', 'barbell_lift', 'set_details', 'notes',
+    'rx_or_scaled', 'pr',
 )
-async def fitness_import_sugarwod(params: ImportSugarWODInput) -> str:
-    """Import workout data from a SugarWOD CSV export.
-    
-    Parses the CSV file, deduplicates against existing records, and imports
-    new workouts. Also extracts lift PRs from barbell lift entries.
-    
-    Args:
-        params: ImportSugarWODInput containing file_path
-        
-    Returns:
-        str: Summary of imported records
-    """
-    file_path = params.file_path
-    
+
+# SQLite decides duplicates: it compares the key after applying the
+# columns' affinity (a date like "20240106" is stored as an INTEGER), which
+# a Python-side set of keys read back from the table would not match
+SUGARWOD_INSERT_SQL = """
+    INSERT INTO workouts (
+        date, title, description, score_type, result_raw,
+        result_display, barbell_lift, set_details, notes,
+        rx_or_scaled, is_pr, source
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'sugarwod')
+    ON CONFLICT(date, title, result_display) DO NOTHING
+"""
+
+SUGARWOD_PR_INSERT_SQL = """
+    INSERT INTO lift_prs (lift_name, weight, reps, date, workout_id)
+    VALUES (?, ?, 1, ?, ?)
+"""
+
+
+def _import_sugarwod(file_path: str) -> str:
+    """Synchronous body of fitness_import_sugarwod."""
     if not os.path.exists(file_path):
         return f"Error: File not found at {file_path}"
     
@@ -277,83 +621,109 @@ async def fitness_import_sugarwod(params: ImportSugarWODInput) -> str:
     
     with get_db() as conn:
         cursor = conn.cursor()
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        # Plain tuples: rows here are only hashed or indexed by position
+        cursor.row_factory = None
+        # One write transaction for the whole import, taken up front so the
+        # preloaded maxima can't go stale under a concurrent writer.
+        # get_db() commits it, or rolls it back if anything below raises.
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Current best 1RM per lift, kept up to date as PRs are staged
+        cursor.execute("""
+            SELECT lift_name, MAX(weight) FROM lift_prs
+            WHERE reps = 1 GROUP BY lift_name
+        """)
+        pr_max = dict(cursor)
+        pr_rows = []
+        
+        # errors='replace': a stray non-UTF-8 byte spoils one cell, instead
+        # of a decode error that would drop a buffer's worth of rows
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            # Plain csv.reader plus one itemgetter instead of DictReader:
+            # no dict per row, and all fields come out in a single C call.
+            # Columns missing from the export point at a '' cell appended
+            # to each row, just past the header's width.
+            reader = csv.reader(f)
+            header = next(reader, [])
+            col = {name: i for i, name in enumerate(header)}
+            width = len(header)
+            fields = itemgetter(*(col.get(name, width) for name in SUGARWOD_COLUMNS))
             
-            for row in reader:
+            while True:
                 try:
-                    date_iso = parse_sugarwod_date(row.get('date', ''))
-                    title = row.get('title', '').strip()
-                    result_display = row.get('best_result_display', '').strip()
-                    
-                    # Check for duplicate
-                    cursor.execute("""
-                        SELECT id FROM workouts 
-                        WHERE date = ? AND title = ? AND result_display = ?
-                    """, (date_iso, title, result_display))
-                    
-                    if cursor.fetchone():
-                        skipped += 1
-                        continue
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    # e.g. a field over csv.field_size_limit(); the reader
+                    # carries on from the next line
+                    errors.append(f"Line {reader.line_num}: {str(e)}")
+                    continue
+                if not row:
+                    continue
+                # Short rows are padded to the header width and long ones
+                # trimmed to it, so the extra '' cell at index `width` is
+                # always there for the columns the export lacks
+                del row[width:]
+                row.extend([''] * (width + 1 - len(row)))
+                try:
+                    (raw_date, title, description, score_type, raw_val,
+                     result_display, barbell_lift_raw, set_details, notes,
+                     rx_or_scaled, pr) = fields(row)
+                    date_iso = parse_sugarwod_date(raw_date)
+                    title = title.strip()
+                    result_display = result_display.strip()
                     
-                    # Parse result_raw
+                    # Parse result_raw. Most exports hold plain integers here,
+                    # which skip the float round-trip and the try block.
                     result_raw = None
-                    raw_val = row.get('best_result_raw', '')
-                    if raw_val:
+                    if raw_val.isdecimal():
+                        result_raw = int(raw_val)
+                    elif raw_val:
                         try:
                             result_raw = int(float(raw_val))
                         except ValueError:
                             pass
                     
-                    # Insert workout
-                    cursor.execute("""
-                        INSERT INTO workouts (
-                            date, title, description, score_type, result_raw,
-                            result_display, barbell_lift, set_details, notes,
-                            rx_or_scaled, is_pr, source
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'sugarwod')
-                    """, (
+                    # A row that hits a constraint fails on its own: SQLite
+                    # undoes just this statement, not the import transaction
+                    changes = conn.total_changes
+                    cursor.execute(SUGARWOD_INSERT_SQL, (
                         date_iso,
                         title,
-                        row.get('description', ''),
-                        row.get('score_type', ''),
+                        description,
+                        score_type,
                         result_raw,
                         result_display,
-                        row.get('barbell_lift', ''),
-                        row.get('set_details', ''),
-                        row.get('notes', ''),
-                        row.get('rx_or_scaled', ''),
-                        row.get('pr', '') == 'PR'
+                        barbell_lift_raw,
+                        set_details,
+                        notes,
+                        rx_or_scaled,
+                        pr == 'PR'
                     ))
-                    
-                    workout_id = cursor.lastrowid
+                    if conn.total_changes == changes:
+                        skipped += 1
+                        continue
                     imported += 1
                     
-                    # Extract lift PR if applicable
-                    barbell_lift = row.get('barbell_lift', '').strip()
-                    if barbell_lift and row.get('score_type') == 'Load':
+                    # Extract lift PR if applicable (only Load rows need the
+                    # stripped lift name)
+                    if score_type == 'Load' and (barbell_lift := barbell_lift_raw.strip()):
                         try:
                             weight = float(result_display)
                             # Check if this is actually a PR
-                            cursor.execute("""
-                                SELECT MAX(weight) FROM lift_prs
-                                WHERE lift_name = ? AND reps = 1
-                            """, (barbell_lift,))
-                            max_weight = cursor.fetchone()[0]
-                            
+                            max_weight = pr_max.get(barbell_lift)
                             if max_weight is None or weight > max_weight:
-                                cursor.execute("""
-                                    INSERT INTO lift_prs (lift_name, weight, reps, date, workout_id)
-                                    VALUES (?, ?, 1, ?, ?)
-                                """, (barbell_lift, weight, date_iso, workout_id))
+                                pr_rows.append((barbell_lift, weight, date_iso, cursor.lastrowid))
+                                pr_max[barbell_lift] = weight
                                 prs_added += 1
                         except ValueError:
                             pass
                     
                 except Exception as e:
-                    errors.append(f"Row error: {str(e)}")
+                    errors.append(f"Line {reader.line_num}: {str(e)}")
         
+        cursor.executemany(SUGARWOD_PR_INSERT_SQL, pr_rows)
         conn.commit()
     
     result = f"## SugarWOD Import Complete\n\n"
@@ -363,14 +733,40 @@ async def fitness_import_sugarwod(params: ImportSugarWODInput) -> str:
     
     if errors:
         result += f"\n### Errors ({len(errors)})\n"
-        for err in errors[:5]:
-            result += f"- {err}\n"
+        result += "".join(f"- {err}\n" for err in errors[:5])
         if len(errors) > 5:
             result += f"- ... and {len(errors) - 5} more\n"
     
     return result
 
 
+@mcp.tool(
+    name="fitness_import_sugarwod",
+    annotations={
+        "title": "Import SugarWOD Export",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def fitness_import_sugarwod(params: ImportSugarWODInput) -> str:
+    """Import workout data from a SugarWOD CSV export.
+    
+    Parses the CSV file, deduplicates against existing records, and imports
+    new workouts. Also extracts lift PRs from barbell lift entries.
+    
+    Args:
+        params: ImportSugarWODInput containing file_path
+        
+    Returns:
+        str: Summary of imported records
+    """
+    # CSV parsing and the inserts are blocking; run them on a worker
+    # thread so other tool calls aren't stalled for the whole import.
+    return await asyncio.to_thread(_import_sugarwod, params.file_path)
+
+
 # ============================================================================
 # Workout Logging
 # ============================================================================
@@ -456,6 +852,7 @@ class ListWorkoutsInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_list_workouts(params: ListWorkoutsInput) -> str:
     """List recent workouts with their IDs.
     
@@ -469,6 +866,8 @@ async def fitness_list_workouts(params: ListWorkoutsInput) -> str:
     """
     with get_db() as conn:
         cursor = conn.cursor()
+        # Plain tuples: the rows are only unpacked positionally below
+        cursor.row_factory = None
         
         if params.date:
             cursor.execute("""
@@ -491,14 +890,15 @@ async def fitness_list_workouts(params: ListWorkoutsInput) -> str:
     if not workouts:
         return "No workouts found."
     
-    result = "## Recent Workouts\n\n"
-    result += "| ID | Date | Title | Result | Source |\n"
-    result += "|-----|------|-------|--------|--------|\n"
-    
-    for w in workouts:
-        result += f"| {w['id']} | {w['date']} | {w['title']} | {w['result_display'] or '-'} | {w['source']} |\n"
+    parts = [
+        "## Recent Workouts\n\n",
+        "| ID | Date | Title | Result | Source |\n",
+        "|-----|------|-------|--------|--------|\n",
+    ]
+    for wid, wdate, wtitle, wresult, wsource in workouts:
+        parts.append(f"| {wid} | {wdate} | {wtitle} | {wresult or '-'} | {wsource} |\n")
     
-    return result
+    return "".join(parts)
 
 
 class UpdateWorkoutInput(BaseModel):
@@ -513,6 +913,20 @@ class UpdateWorkoutInput(BaseModel):
     notes: Optional[str] = Field(default=None, description="New notes")
 
 
+# (input field, column) pairs fitness_update_workout can set, in SQL order
+WORKOUT_UPDATE_FIELDS = (
+    ("date", "date"),
+    ("title", "title"),
+    ("description", "description"),
+    ("result", "result_display"),
+    ("notes", "notes"),
+)
+WORKOUT_UPDATE_SQL = update_sql_by_shape(
+    "workouts", "id", [column for _, column in WORKOUT_UPDATE_FIELDS],
+    returning="title, date",
+)
+
+
 @mcp.tool(
     name="fitness_update_workout",
     annotations={
@@ -535,26 +949,15 @@ async def fitness_update_workout(params: UpdateWorkoutInput) -> str:
     Returns:
         str: Confirmation of update
     """
-    updates = []
+    columns = []
     values = []
+    for field, column in WORKOUT_UPDATE_FIELDS:
+        value = getattr(params, field)
+        if value is not None:
+            columns.append(column)
+            values.append(value)
     
-    if params.date is not None:
-        updates.append("date = ?")
-        values.append(params.date)
-    if params.title is not None:
-        updates.append("title = ?")
-        values.append(params.title)
-    if params.description is not None:
-        updates.append("description = ?")
-        values.append(params.description)
-    if params.result is not None:
-        updates.append("result_display = ?")
-        values.append(params.result)
-    if params.notes is not None:
-        updates.append("notes = ?")
-        values.append(params.notes)
-    
-    if not updates:
+    if not columns:
         return "No fields to update provided."
     
     values.append(params.workout_id)
@@ -562,19 +965,13 @@ async def fitness_update_workout(params: UpdateWorkoutInput) -> str:
     with get_db() as conn:
         cursor = conn.cursor()
         
-        # Check workout exists
-        cursor.execute("SELECT id, title, date FROM workouts WHERE id = ?", (params.workout_id,))
+        # RETURNING doubles as the existence check: no row, no workout
+        cursor.execute(WORKOUT_UPDATE_SQL[tuple(columns)], values)
         workout = cursor.fetchone()
         
         if not workout:
             return f"Error: Workout with ID {params.workout_id} not found."
         
-        cursor.execute(f"""
-            UPDATE workouts
-            SET {', '.join(updates)}
-            WHERE id = ?
-        """, values)
-        
         conn.commit()
     
     return f"✅ Updated workout #{params.workout_id} ({workout['title']} on {workout['date']})"
@@ -616,14 +1013,15 @@ async def fitness_delete_workout(params: DeleteWorkoutInput) -> str:
     with get_db() as conn:
         cursor = conn.cursor()
         
-        # Check workout exists
-        cursor.execute("SELECT id, title, date FROM workouts WHERE id = ?", (params.workout_id,))
+        # RETURNING doubles as the existence check: no row, no workout
+        cursor.execute(
+            "DELETE FROM workouts WHERE id = ? RETURNING title, date", (params.workout_id,)
+        )
         workout = cursor.fetchone()
         
         if not workout:
             return f"Error: Workout with ID {params.workout_id} not found."
         
-        cursor.execute("DELETE FROM workouts WHERE id = ?", (params.workout_id,))
         conn.commit()
     
     return f"🗑️ Deleted workout #{params.workout_id} ({workout['title']} on {workout['date']})"
@@ -667,25 +1065,31 @@ async def fitness_log_lift(params: LogLiftInput) -> str:
         str: Confirmation including PR status if applicable
     """
     lift_date = params.date or date.today().isoformat()
-    is_pr = False
     
     with get_db() as conn:
         cursor = conn.cursor()
         
-        # Check for PR at this rep range
+        # Record a PR only if it beats the best at this rep range. A row
+        # comes back only when one was inserted, carrying the previous best
+        # (the max over every other row for this lift and rep count).
         cursor.execute("""
-            SELECT MAX(weight) FROM lift_prs
-            WHERE lift_name = ? AND reps = ?
-        """, (params.lift_name, params.reps))
-        
-        max_weight = cursor.fetchone()[0]
-        
-        if max_weight is None or params.weight > max_weight:
-            is_pr = True
-            cursor.execute("""
-                INSERT INTO lift_prs (lift_name, weight, reps, date, notes)
-                VALUES (?, ?, ?, ?, ?)
-            """, (params.lift_name, params.weight, params.reps, lift_date, params.notes))
+            INSERT INTO lift_prs (lift_name, weight, reps, date, notes)
+            SELECT :lift, :weight, :reps, :date, :notes
+            WHERE :weight > COALESCE((
+                SELECT MAX(weight) FROM lift_prs
+                WHERE lift_name = :lift AND reps = :reps
+            ), 0)
+            RETURNING (
+                SELECT MAX(p.weight) FROM lift_prs p
+                WHERE p.lift_name = :lift AND p.reps = :reps AND p.id != lift_prs.id
+            )
+        """, {
+            "lift": params.lift_name, "weight": params.weight, "reps": params.reps,
+            "date": lift_date, "notes": params.notes,
+        })
+        pr_row = cursor.fetchone()
+        is_pr = pr_row is not None
+        max_weight = pr_row[0] if is_pr else None
         
         # Also log as a workout
         cursor.execute("""
@@ -736,6 +1140,15 @@ class AddProteinInput(BaseModel):
     food: Optional[str] = Field(default=None, description="What food this came from")
 
 
+# Progress bars for 0%..100%+ in 10% steps, built once
+_BARS = tuple("█" * n + "░" * (10 - n) for n in range(11))
+
+
+def protein_bar(pct: int) -> str:
+    """10-cell progress bar for a percentage, clamped to 0-100%."""
+    return _BARS[max(0, min(10, pct // 10))]
+
+
 @mcp.tool(
     name="fitness_log_protein",
     annotations={
@@ -767,13 +1180,13 @@ async def fitness_log_protein(params: LogProteinInput) -> str:
         cursor.execute("""
             INSERT INTO protein_log (date, grams, notes)
             VALUES (?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET grams = ?, notes = ?
-        """, (protein_date, params.grams, params.notes, params.grams, params.notes))
+            ON CONFLICT(date) DO UPDATE SET grams = excluded.grams, notes = excluded.notes
+        """, (protein_date, params.grams, params.notes))
         
         conn.commit()
     
     pct = round(params.grams / target * 100)
-    bar = "█" * (pct // 10) + "░" * (10 - pct // 10)
+    bar = protein_bar(pct)
     
     return f"✅ Protein logged: **{params.grams}g** on {protein_date}\n\nProgress: [{bar}] {pct}% of {target}g goal"
 
@@ -805,32 +1218,26 @@ async def fitness_add_protein(params: AddProteinInput) -> str:
     with get_db() as conn:
         cursor = conn.cursor()
         
-        # Get current total
-        cursor.execute("SELECT grams, notes FROM protein_log WHERE date = ?", (today,))
-        row = cursor.fetchone()
-        
-        current = row['grams'] if row else 0
-        current_notes = row['notes'] if row else ""
-        
-        new_total = current + params.grams
-        
-        # Append to notes
+        # Add to the running total and append to notes in one statement
         new_note = params.food or f"+{params.grams}g"
-        if current_notes:
-            new_notes = f"{current_notes}; {new_note}"
-        else:
-            new_notes = new_note
-        
         cursor.execute("""
             INSERT INTO protein_log (date, grams, notes)
             VALUES (?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET grams = ?, notes = ?
-        """, (today, new_total, new_notes, new_total, new_notes))
+            ON CONFLICT(date) DO UPDATE SET
+                grams = protein_log.grams + excluded.grams,
+                notes = CASE
+                    WHEN protein_log.notes IS NULL OR protein_log.notes = ''
+                    THEN excluded.notes
+                    ELSE protein_log.notes || '; ' || excluded.notes
+                END
+            RETURNING grams
+        """, (today, params.grams, new_note))
+        new_total = cursor.fetchone()['grams']
         
         conn.commit()
     
     pct = round(new_total / target * 100)
-    bar = "█" * min(pct // 10, 10) + "░" * max(10 - pct // 10, 0)
+    bar = protein_bar(pct)
     
     result = f"✅ Added **{params.grams}g** protein"
     if params.food:
@@ -854,6 +1261,13 @@ class UpdateProteinInput(BaseModel):
     notes: Optional[str] = Field(default=None, description="New notes value")
 
 
+# Columns fitness_update_protein can set (input fields share the names)
+PROTEIN_UPDATE_FIELDS = ("grams", "notes")
+PROTEIN_UPDATE_SQL = update_sql_by_shape(
+    "protein_log", "date", PROTEIN_UPDATE_FIELDS, returning="grams",
+)
+
+
 @mcp.tool(
     name="fitness_update_protein",
     annotations={
@@ -875,17 +1289,15 @@ async def fitness_update_protein(params: UpdateProteinInput) -> str:
     Returns:
         str: Confirmation of update
     """
-    updates = []
+    columns = []
     values = []
+    for column in PROTEIN_UPDATE_FIELDS:
+        value = getattr(params, column)
+        if value is not None:
+            columns.append(column)
+            values.append(value)
     
-    if params.grams is not None:
-        updates.append("grams = ?")
-        values.append(params.grams)
-    if params.notes is not None:
-        updates.append("notes = ?")
-        values.append(params.notes)
-    
-    if not updates:
+    if not columns:
         return "No fields to update provided."
     
     values.append(params.date)
@@ -893,28 +1305,18 @@ async def fitness_update_protein(params: UpdateProteinInput) -> str:
     with get_db() as conn:
         cursor = conn.cursor()
         
-        # Check entry exists
-        cursor.execute("SELECT * FROM protein_log WHERE date = ?", (params.date,))
-        entry = cursor.fetchone()
+        # RETURNING doubles as the existence check and the re-read
+        cursor.execute(PROTEIN_UPDATE_SQL[tuple(columns)], values)
+        updated = cursor.fetchone()
         
-        if not entry:
+        if not updated:
             return f"No protein entry found for {params.date}"
         
-        cursor.execute(f"""
-            UPDATE protein_log
-            SET {', '.join(updates)}
-            WHERE date = ?
-        """, values)
-        
-        # Get updated entry
-        cursor.execute("SELECT grams, notes FROM protein_log WHERE date = ?", (params.date,))
-        updated = cursor.fetchone()
-        
         conn.commit()
     
     target = 160
     pct = round(updated['grams'] / target * 100)
-    bar = "█" * min(pct // 10, 10) + "░" * max(10 - pct // 10, 0)
+    bar = protein_bar(pct)
     
     return f"✅ Updated protein for {params.date}: **{updated['grams']}g**\n[{bar}] {pct}% of {target}g goal"
 
@@ -958,28 +1360,27 @@ async def fitness_log_weight(params: LogWeightInput) -> str:
     with get_db() as conn:
         cursor = conn.cursor()
         
+        # Upsert and fetch the previous weigh-in (for the trend) in one go
         cursor.execute("""
             INSERT INTO weight_log (date, weight, notes)
-            VALUES (?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET weight = ?, notes = ?
-        """, (weight_date, params.weight, params.notes, params.weight, params.notes))
-        
-        # Get trend
-        cursor.execute("""
-            SELECT weight, date FROM weight_log
-            WHERE date < ?
-            ORDER BY date DESC LIMIT 1
-        """, (weight_date,))
+            VALUES (:date, :weight, :notes)
+            ON CONFLICT(date) DO UPDATE SET weight = excluded.weight, notes = excluded.notes
+            RETURNING
+                (SELECT weight FROM weight_log WHERE date < :date
+                 ORDER BY date DESC LIMIT 1) AS prev_weight,
+                (SELECT date FROM weight_log WHERE date < :date
+                 ORDER BY date DESC LIMIT 1) AS prev_date
+        """, {"date": weight_date, "weight": params.weight, "notes": params.notes})
         
         prev = cursor.fetchone()
         conn.commit()
     
     result = f"✅ Weight logged: **{params.weight} lbs** on {weight_date}"
     
-    if prev:
-        diff = params.weight - prev['weight']
+    if prev['prev_date'] is not None:
+        diff = params.weight - prev['prev_weight']
         direction = "↑" if diff > 0 else "↓" if diff < 0 else "→"
-        result += f"\n\nChange from {prev['date']}: {direction} {abs(diff):.1f} lbs"
+        result += f"\n\nChange from {prev['prev_date']}: {direction} {abs(diff):.1f} lbs"
     
     return result
 
@@ -988,16 +1389,49 @@ async def fitness_log_weight(params: LogWeightInput) -> str:
 # Readiness Logging
 # ============================================================================
 
+# Star ratings for 0..5, built once
+_STARS = tuple("⭐" * n + "☆" * (5 - n) for n in range(6))
+
+
 class LogReadinessInput(BaseModel):
     """Input for logging daily readiness."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
     sleep_quality: int = Field(..., description="Sleep quality 1-5 (5=great)", ge=1, le=5)
     energy: int = Field(..., description="Energy level 1-5 (5=high)", ge=1, le=5)
     soreness: int = Field(..., description="Muscle soreness 1-5 (5=very sore)", ge=1, le=5)
     stress: int = Field(..., description="Stress level 1-5 (5=very stressed)", ge=1, le=5)
-    date: Optional[str] = Field(default=None, description="Date (YYYY-MM-DD), defaults to today")
-    notes: Optional[str] = Field(default=None, description="Notes about how you're feeling")
+    date: Optional[str] = Field(default=None, description="Date (YYYY-MM-DD), defaults to today", pattern=ISO_DATE_PATTERN)
+    notes: Optional[StrippedStr] = Field(default=None, description="Notes about how you're feeling")
+
+
+READINESS_UPSERT_SQL = """
+    INSERT INTO readiness_log (date, sleep_quality, energy, soreness, stress, notes)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        sleep_quality = excluded.sleep_quality, energy = excluded.energy,
+        soreness = excluded.soreness, stress = excluded.stress, notes = excluded.notes
+"""
+
+
+def _readiness_row(readiness_date: str, entry: LogReadinessInput) -> tuple:
+    """Bind values for READINESS_UPSERT_SQL."""
+    return (readiness_date, entry.sleep_quality, entry.energy, entry.soreness, entry.stress, entry.notes)
+
+
+def readiness_score(sleep_quality: int, energy: int, soreness: int, stress: int) -> float:
+    """Readiness on a 1-5 scale (higher is better, soreness and stress are inverted)."""
+    return (sleep_quality + energy + (6 - soreness) + (6 - stress)) / 4
+
+
+def _save_readiness(rows: List[tuple]) -> None:
+    """Upsert readiness rows in a single transaction."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        
+        cursor.executemany(READINESS_UPSERT_SQL, rows)
+        
+        conn.commit()
 
 
 @mcp.tool(
@@ -1023,42 +1457,31 @@ async def fitness_log_readiness(params: LogReadinessInput) -> str:
     """
     readiness_date = params.date or date.today().isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO readiness_log (date, sleep_quality, energy, soreness, stress, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET 
-                sleep_quality = ?, energy = ?, soreness = ?, stress = ?, notes = ?
-        """, (
-            readiness_date, params.sleep_quality, params.energy, params.soreness, params.stress, params.notes,
-            params.sleep_quality, params.energy, params.soreness, params.stress, params.notes
-        ))
-        
-        conn.commit()
+    # sqlite3 blocks; keep it off the event loop.
+    await asyncio.to_thread(_save_readiness, [_readiness_row(readiness_date, params)])
     
-    # Calculate readiness score (higher is better, soreness and stress are inverted)
-    readiness_score = (params.sleep_quality + params.energy + (6 - params.soreness) + (6 - params.stress)) / 4
+    score = readiness_score(params.sleep_quality, params.energy, params.soreness, params.stress)
     
     # Training recommendation
-    if readiness_score >= 4:
+    if score >= 4:
         rec = "💪 **Go hard** - You're well recovered, push it today"
-    elif readiness_score >= 3:
+    elif score >= 3:
         rec = "✅ **Normal training** - Good to go with planned workout"
-    elif readiness_score >= 2:
+    elif score >= 2:
         rec = "⚠️ **Modify** - Consider lighter weights or shorter session"
     else:
         rec = "🛑 **Rest or light movement** - Prioritize recovery today"
     
-    result = f"## Readiness Check-in: {readiness_date}\n\n"
-    result += f"| Metric | Score |\n|--------|-------|\n"
-    result += f"| Sleep | {'⭐' * params.sleep_quality}{'☆' * (5 - params.sleep_quality)} |\n"
-    result += f"| Energy | {'⭐' * params.energy}{'☆' * (5 - params.energy)} |\n"
-    result += f"| Soreness | {'⭐' * params.soreness}{'☆' * (5 - params.soreness)} |\n"
-    result += f"| Stress | {'⭐' * params.stress}{'☆' * (5 - params.stress)} |\n\n"
-    result += f"**Readiness Score:** {readiness_score:.1f}/5\n\n"
-    result += rec
+    result = (
+        f"## Readiness Check-in: {readiness_date}\n\n"
+        "| Metric | Score |\n|--------|-------|\n"
+        f"| Sleep | {_STARS[params.sleep_quality]} |\n"
+        f"| Energy | {_STARS[params.energy]} |\n"
+        f"| Soreness | {_STARS[params.soreness]} |\n"
+        f"| Stress | {_STARS[params.stress]} |\n\n"
+        f"**Readiness Score:** {score:.1f}/5\n\n"
+        f"{rec}"
+    )
     
     if params.notes:
         result += f"\n\nNotes: {params.notes}"
@@ -1066,14 +1489,76 @@ async def fitness_log_readiness(params: LogReadinessInput) -> str:
     return result
 
 
+class LogReadinessBatchInput(BaseModel):
+    """Input for backfilling several readiness check-ins at once."""
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
+    entries: List[LogReadinessInput] = Field(..., description="Readiness check-ins to log; a later entry for the same date wins", min_length=1, max_length=366)
+
+
+@mcp.tool(
+    name="fitness_log_readiness_batch",
+    annotations={
+        "title": "Log Readiness Check-ins (Batch)",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def fitness_log_readiness_batch(params: LogReadinessBatchInput) -> str:
+    """Log several readiness check-ins in one transaction.
+    
+    Meant for backfilling history; entries without a date are logged for today.
+    
+    Args:
+        params: LogReadinessBatchInput with the entries to log
+        
+    Returns:
+        str: Table of the logged dates and readiness scores
+    """
+    today = date.today().isoformat()
+    # One row per date, the last entry winning as it would in the UPSERT,
+    # so the reply lists exactly what was stored
+    by_date = {}
+    for entry in params.entries:
+        readiness_date = entry.date or today
+        by_date[readiness_date] = _readiness_row(readiness_date, entry)
+    rows = list(by_date.values())
+    
+    await asyncio.to_thread(_save_readiness, rows)
+    
+    parts = [
+        f"## Logged {len(rows)} Readiness Check-ins\n\n",
+        "| Date | Score |\n|------|-------|\n",
+    ]
+    for readiness_date, *scores, _ in rows:
+        parts.append(f"| {readiness_date} | {readiness_score(*scores):.1f}/5 |\n")
+    
+    return "".join(parts)
+
+
 class DeleteReadinessInput(BaseModel):
     """Input for deleting a readiness entry."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
-    date: str = Field(..., description="Date of the readiness entry to delete (YYYY-MM-DD)")
+    date: str = Field(..., description="Date of the readiness entry to delete (YYYY-MM-DD)", pattern=ISO_DATE_PATTERN)
     confirm: bool = Field(..., description="Must be True to confirm deletion")
 
 
+def _delete_readiness(entry_date: str) -> bool:
+    """Delete the readiness row for entry_date; False if there wasn't one."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        
+        # RETURNING doubles as the existence check: no row, no entry
+        cursor.execute("DELETE FROM readiness_log WHERE date = ? RETURNING 1", (entry_date,))
+        deleted = cursor.fetchone() is not None
+        conn.commit()
+    
+    return deleted
+
+
 @mcp.tool(
     name="fitness_delete_readiness",
     annotations={
@@ -1096,17 +1581,8 @@ async def fitness_delete_readiness(params: DeleteReadinessInput) -> str:
     if not params.confirm:
         return "Deletion not confirmed. Set confirm=True to delete."
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM readiness_log WHERE date = ?", (params.date,))
-        entry = cursor.fetchone()
-        
-        if not entry:
-            return f"No readiness entry found for {params.date}"
-        
-        cursor.execute("DELETE FROM readiness_log WHERE date = ?", (params.date,))
-        conn.commit()
+    if not await asyncio.to_thread(_delete_readiness, params.date):
+        return f"No readiness entry found for {params.date}"
     
     return f"🗑️ Deleted readiness entry for {params.date}"
 
@@ -1117,13 +1593,41 @@ async def fitness_delete_readiness(params: DeleteReadinessInput) -> str:
 
 class LogMobilityInput(BaseModel):
     """Input for logging mobility work."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
     duration_minutes: int = Field(..., description="Duration in minutes", ge=1, le=120)
-    focus_area: Optional[str] = Field(default=None, description="Focus area (e.g., 'hips', 'ankles', 'shoulders')")
-    exercises: Optional[str] = Field(default=None, description="Exercises performed")
-    date: Optional[str] = Field(default=None, description="Date (YYYY-MM-DD), defaults to today")
-    notes: Optional[str] = Field(default=None, description="Notes")
+    focus_area: Optional[StrippedStr] = Field(default=None, description="Focus area (e.g., 'hips', 'ankles', 'shoulders')")
+    exercises: Optional[StrippedStr] = Field(default=None, description="Exercises performed")
+    date: Optional[str] = Field(default=None, description="Date (YYYY-MM-DD), defaults to today", pattern=ISO_DATE_PATTERN)
+    notes: Optional[StrippedStr] = Field(default=None, description="Notes")
+
+
+MOBILITY_INSERT_SQL = """
+    INSERT INTO mobility_log (date, duration_minutes, focus_area, exercises, notes)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+MOBILITY_TOTALS_SQL = """
+    SELECT COUNT(*) as sessions, SUM(duration_minutes) as total_mins
+    FROM mobility_log WHERE date >= ?
+"""
+
+
+def _save_mobility(mobility_date: str, params: LogMobilityInput) -> sqlite3.Row:
+    """Insert a mobility session and return the trailing 7-day totals."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(MOBILITY_INSERT_SQL, (mobility_date, params.duration_minutes, params.focus_area, params.exercises, params.notes))
+        
+        # Get weekly stats
+        week_ago = (date.fromisoformat(mobility_date) - timedelta(days=7)).isoformat()
+        cursor.execute(MOBILITY_TOTALS_SQL, (week_ago,))
+        
+        stats = cursor.fetchone()
+        conn.commit()
+    
+    return stats
 
 
 @mcp.tool(
@@ -1149,33 +1653,17 @@ async def fitness_log_mobility(params: LogMobilityInput) -> str:
     """
     mobility_date = params.date or date.today().isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO mobility_log (date, duration_minutes, focus_area, exercises, notes)
-            VALUES (?, ?, ?, ?, ?)
-        """, (mobility_date, params.duration_minutes, params.focus_area, params.exercises, params.notes))
-        
-        # Get weekly stats
-        week_ago = (datetime.strptime(mobility_date, "%Y-%m-%d") - timedelta(days=7)).strftime("%Y-%m-%d")
-        cursor.execute("""
-            SELECT COUNT(*) as sessions, SUM(duration_minutes) as total_mins
-            FROM mobility_log WHERE date >= ?
-        """, (week_ago,))
-        
-        stats = cursor.fetchone()
-        conn.commit()
+    stats = await asyncio.to_thread(_save_mobility, mobility_date, params)
     
-    result = f"✅ Logged: **{params.duration_minutes} min** mobility work on {mobility_date}"
+    parts = [f"✅ Logged: **{params.duration_minutes} min** mobility work on {mobility_date}"]
     if params.focus_area:
-        result += f"\n- Focus: {params.focus_area}"
+        parts.append(f"\n- Focus: {params.focus_area}")
     if params.exercises:
-        result += f"\n- Exercises: {params.exercises}"
+        parts.append(f"\n- Exercises: {params.exercises}")
     
-    result += f"\n\n**This week:** {stats['sessions']} sessions, {stats['total_mins'] or 0} total minutes"
+    parts.append(f"\n\n**This week:** {stats['sessions']} sessions, {stats['total_mins'] or 0} total minutes")
     
-    return result
+    return "".join(parts)
 
 
 # ============================================================================
@@ -1279,12 +1767,93 @@ STARTER_PROGRAM = {
     ]
 }
 
+# STARTER_PROGRAM never changes, so serialize it once for fitness_set_program.
+_STARTER_PROGRAM_JSON = json.dumps(STARTER_PROGRAM)
+
+# Everything after the dates in fitness_set_program's reply is fixed too
+_STARTER_PROGRAM_FOOTER = (
+    "### Key Principles\n"
+    + "".join(f"- {p}\n" for p in STARTER_PROGRAM['principles'])
+    + "\n\nUse `fitness_get_today` to see each day's workout!"
+)
+
+REST_DAY = {"name": "Rest", "exercises": []}
+
+
+def flatten_program_days(program_data: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
+    """Map (week index, day name) to that day's workout.
+
+    Weeks whose 'days' is just a note ("Same as Week 1 ...") get week 1's
+    days, so lookups never need to special-case them.
+    """
+    weeks = program_data['weeks']
+    first_days = weeks[0]['days']
+    flat = {}
+    for week_idx, week_data in enumerate(weeks):
+        days = week_data.get('days')
+        if not isinstance(days, dict):
+            days = first_days
+        for day_name, workout in days.items():
+            flat[(week_idx, day_name)] = workout
+    return flat
+
+
+_STARTER_PROGRAM_DAYS = flatten_program_days(STARTER_PROGRAM)
+
+# Last program blob parsed by load_program_data, as (id, raw JSON, parsed, days).
+_program_cache: tuple = (None, None, None, None)
+
+
+def load_program_data(program_id: int, raw: str) -> tuple:
+    """Parse a programs.program_data blob, reusing the last result.
+
+    Returns (program_data, flattened days). Keyed on the row id and checked
+    against the raw text too, so a restored DB that reuses an id with
+    different contents still gets reparsed. Both dicts are shared; callers
+    must treat them as read-only.
+    """
+    global _program_cache
+    cached_id, cached_raw, parsed, days = _program_cache
+    if cached_id != program_id or cached_raw != raw:
+        parsed = json.loads(raw)
+        days = flatten_program_days(parsed)
+        _program_cache = (program_id, raw, parsed, days)
+    return parsed, days
+
+
+# Indexed by date.weekday(); matches the day keys in program_data
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
 
 class GetTodayInput(BaseModel):
     """Input for getting today's workout."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
-    
-    date: Optional[str] = Field(default=None, description="Date to check (YYYY-MM-DD), defaults to today")
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
+    date: Optional[str] = Field(default=None, description="Date to check (YYYY-MM-DD), defaults to today", pattern=ISO_DATE_PATTERN)
+
+
+# Active program, the day's readiness and the day's protein in one round
+# trip. Each side is LEFT JOINed onto a single dummy row, so a missing one
+# just comes back as NULLs.
+TODAY_SQL = """
+    SELECT
+        p.id AS program_id, p.program_data, p.start_date,
+        r.id AS readiness_id, r.sleep_quality, r.energy, r.soreness, r.stress,
+        (SELECT grams FROM protein_log WHERE date = :date) AS protein_grams
+    FROM (SELECT 1)
+    LEFT JOIN (
+        SELECT id, program_data, start_date FROM programs
+        WHERE is_active = TRUE
+        ORDER BY start_date DESC LIMIT 1
+    ) AS p
+    LEFT JOIN readiness_log AS r ON r.date = :date
+"""
+
+
+def _fetch_today(check_date: str) -> sqlite3.Row:
+    """Lookup query behind fitness_get_today."""
+    with get_db() as conn:
+        return conn.execute(TODAY_SQL, {"date": check_date}).fetchone()
 
 
 @mcp.tool(
@@ -1297,6 +1866,7 @@ class GetTodayInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_today(params: GetTodayInput) -> str:
     """Get the prescribed workout for today based on active program.
     
@@ -1310,104 +1880,115 @@ async def fitness_get_today(params: GetTodayInput) -> str:
         str: Today's workout prescription
     """
     check_date = params.date or date.today().isoformat()
-    dt = datetime.strptime(check_date, "%Y-%m-%d")
-    day_name = dt.strftime("%A")
+    dt = date.fromisoformat(check_date)
+    day_name = DAY_NAMES[dt.weekday()]
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Check for active program
-        cursor.execute("""
-            SELECT * FROM programs WHERE is_active = TRUE
-            ORDER BY start_date DESC LIMIT 1
-        """)
-        program = cursor.fetchone()
-        
-        # Get today's readiness
-        cursor.execute("""
-            SELECT * FROM readiness_log WHERE date = ?
-        """, (check_date,))
-        readiness = cursor.fetchone()
-        
-        # Get today's protein
-        cursor.execute("""
-            SELECT grams FROM protein_log WHERE date = ?
-        """, (check_date,))
-        protein = cursor.fetchone()
+    today = await asyncio.to_thread(_fetch_today, check_date)
+    
+    program = today['program_id'] is not None
+    readiness = today if today['readiness_id'] is not None else None
     
     # Use default program if none active
     if program:
-        program_data = json.loads(program['program_data'])
+        program_data, program_days = load_program_data(today['program_id'], today['program_data'])
     else:
-        program_data = STARTER_PROGRAM
+        program_data, program_days = STARTER_PROGRAM, _STARTER_PROGRAM_DAYS
     
     # Calculate which week we're in (default to week 1 if no start date)
-    if program and program['start_date']:
-        start = datetime.strptime(program['start_date'], "%Y-%m-%d")
-        week_num = min(((dt - start).days // 7) + 1, 4)
+    if program and today['start_date']:
+        start = date.fromisoformat(today['start_date'])
+        week_num = min((dt.toordinal() - start.toordinal()) // 7 + 1, 4)
     else:
         week_num = 1
     
     # Get today's workout
-    week_data = program_data['weeks'][min(week_num - 1, len(program_data['weeks']) - 1)]
-    
-    if isinstance(week_data.get('days'), dict):
-        day_workout = week_data['days'].get(day_name, {"name": "Rest", "exercises": []})
-    else:
-        # For weeks that reference week 1
-        day_workout = program_data['weeks'][0]['days'].get(day_name, {"name": "Rest", "exercises": []})
-    
-    result = f"## {day_name}, {check_date}\n"
-    result += f"### Week {week_num}: {week_data.get('theme', '')}\n\n"
+    weeks = program_data['weeks']
+    week_idx = min(week_num - 1, len(weeks) - 1)
+    week_data = weeks[week_idx]
+    # week_idx goes negative for dates before the start; normalize it the
+    # way the list index above just did
+    day_workout = program_days.get((week_idx % len(weeks), day_name), REST_DAY)
+    
+    parts = [
+        f"## {day_name}, {check_date}\n",
+        f"### Week {week_num}: {week_data.get('theme', '')}\n\n",
+    ]
     
     if week_data.get('notes'):
-        result += f"*{week_data['notes']}*\n\n"
+        parts.append(f"*{week_data['notes']}*\n\n")
     
-    result += f"## {day_workout['name']}\n\n"
+    parts.append(f"## {day_workout['name']}\n\n")
     
     # Readiness adjustment
     if readiness:
-        score = (readiness['sleep_quality'] + readiness['energy'] + 
-                (6 - readiness['soreness']) + (6 - readiness['stress'])) / 4
+        score = readiness_score(
+            readiness['sleep_quality'], readiness['energy'], readiness['soreness'], readiness['stress'],
+        )
         if score < 2.5:
-            result += "⚠️ **Low readiness today** - consider reducing volume or intensity\n\n"
+            parts.append("⚠️ **Low readiness today** - consider reducing volume or intensity\n\n")
         elif score >= 4:
-            result += "💪 **High readiness** - push it today!\n\n"
+            parts.append("💪 **High readiness** - push it today!\n\n")
     
     # Exercises
     if day_workout.get('exercises'):
-        result += "### Exercises\n\n"
+        parts.append("### Exercises\n\n")
         for ex in day_workout['exercises']:
             reps = ex.get('reps', '')
-            result += f"- **{ex['name']}**: {ex['sets']} x {reps}"
+            parts.append(f"- **{ex['name']}**: {ex['sets']} x {reps}")
             if ex.get('notes'):
-                result += f" - *{ex['notes']}*"
-            result += "\n"
+                parts.append(f" - *{ex['notes']}*")
+            parts.append("\n")
     
     if day_workout.get('conditioning'):
-        result += f"\n### Conditioning\n{day_workout['conditioning']}\n"
+        parts.append(f"\n### Conditioning\n{day_workout['conditioning']}\n")
     
     if day_workout.get('mobility'):
-        result += f"\n### Mobility\n{day_workout['mobility']}\n"
+        parts.append(f"\n### Mobility\n{day_workout['mobility']}\n")
     
     # Protein check
-    result += "\n---\n"
-    if protein:
-        result += f"📊 Protein so far: {protein['grams']}g / 160g"
+    parts.append("\n---\n")
+    if today['protein_grams'] is not None:
+        parts.append(f"📊 Protein so far: {today['protein_grams']}g / 160g")
     else:
-        result += "📊 No protein logged yet today"
+        parts.append("📊 No protein logged yet today")
     
-    return result
+    return "".join(parts)
 
 
 class SetProgramInput(BaseModel):
     """Input for setting the active program."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid', frozen=True)
     
     start_date: Optional[str] = Field(default=None, description="Program start date (YYYY-MM-DD), defaults to next Monday")
     use_default: bool = Field(default=True, description="Use the default 4-week starter program")
 
 
+PROGRAM_INSERT_SQL = """
+    INSERT INTO programs (name, description, start_date, end_date, is_active, program_data)
+    VALUES (?, ?, ?, ?, TRUE, ?)
+"""
+
+
+def _activate_program(program: Dict[str, Any], program_json: str, start_str: str, end_str: str) -> None:
+    """Deactivate every program and insert program as the active one."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        
+        # Deactivate existing programs
+        cursor.execute("UPDATE programs SET is_active = FALSE")
+        
+        # Insert new program
+        cursor.execute(PROGRAM_INSERT_SQL, (
+            program['name'],
+            program['description'],
+            start_str,
+            end_str,
+            program_json
+        ))
+        
+        conn.commit()
+
+
 @mcp.tool(
     name="fitness_set_program",
     annotations={
@@ -1430,51 +2011,27 @@ async def fitness_set_program(params: SetProgramInput) -> str:
         str: Confirmation of program activation
     """
     # Calculate start date (next Monday if not specified)
+    # strptime (not fromisoformat) so unpadded input like 2024-3-4 still works
     if params.start_date:
-        start = datetime.strptime(params.start_date, "%Y-%m-%d")
+        start = datetime.strptime(params.start_date, "%Y-%m-%d").date()
     else:
         today = date.today()
-        days_until_monday = (7 - today.weekday()) % 7
-        if days_until_monday == 0:
-            days_until_monday = 7
-        start = today + timedelta(days=days_until_monday)
+        start = date.fromordinal(today.toordinal() + ((7 - today.weekday()) % 7 or 7))
     
-    start_str = start.strftime("%Y-%m-%d") if isinstance(start, date) else start.strftime("%Y-%m-%d")
-    end_str = (datetime.strptime(start_str, "%Y-%m-%d") + timedelta(weeks=4)).strftime("%Y-%m-%d")
+    start_str = start.isoformat()
+    end_str = date.fromordinal(start.toordinal() + 28).isoformat()
     
     program = STARTER_PROGRAM
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Deactivate existing programs
-        cursor.execute("UPDATE programs SET is_active = FALSE")
-        
-        # Insert new program
-        cursor.execute("""
-            INSERT INTO programs (name, description, start_date, end_date, is_active, program_data)
-            VALUES (?, ?, ?, ?, TRUE, ?)
-        """, (
-            program['name'],
-            program['description'],
-            start_str,
-            end_str,
-            json.dumps(program)
-        ))
-        
-        conn.commit()
+    await asyncio.to_thread(_activate_program, program, _STARTER_PROGRAM_JSON, start_str, end_str)
     
-    result = f"## Program Activated! 🎯\n\n"
-    result += f"**{program['name']}**\n\n"
-    result += f"- Start: {start_str}\n"
-    result += f"- End: {end_str}\n\n"
-    result += "### Key Principles\n"
-    for p in program['principles']:
-        result += f"- {p}\n"
-    
-    result += f"\n\nUse `fitness_get_today` to see each day's workout!"
-    
-    return result
+    return (
+        "## Program Activated! 🎯\n\n"
+        f"**{program['name']}**\n\n"
+        f"- Start: {start_str}\n"
+        f"- End: {end_str}\n\n"
+        f"{_STARTER_PROGRAM_FOOTER}"
+    )
 
 
 # ============================================================================
@@ -1490,6 +2047,28 @@ class GetLiftHistoryInput(BaseModel):
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN)
 
 
+# With TRIGRAM_FTS the LIKE runs against the trigram index, which has the
+# same (case-insensitive) substring semantics as the plain LIKE fallback.
+if TRIGRAM_FTS:
+    _WORKOUT_LIFT_MATCH = "id IN (SELECT rowid FROM workouts_lift_fts WHERE barbell_lift LIKE ?)"
+    _PR_LIFT_MATCH = "id IN (SELECT rowid FROM lift_prs_fts WHERE lift_name LIKE ?)"
+else:
+    _WORKOUT_LIFT_MATCH = "barbell_lift LIKE ?"
+    _PR_LIFT_MATCH = "lift_name LIKE ?"
+
+LIFT_HISTORY_SQL = f"""
+    SELECT date, result_display, notes, is_pr, set_details
+    FROM workouts
+    WHERE {_WORKOUT_LIFT_MATCH}
+    ORDER BY date DESC, id DESC
+    LIMIT ?
+"""
+LIFT_PR_SQL = f"""
+    SELECT MAX(weight) as pr, date FROM lift_prs
+    WHERE {_PR_LIFT_MATCH}
+"""
+
+
 @mcp.tool(
     name="fitness_get_lift_history",
     annotations={
@@ -1500,6 +2079,7 @@ class GetLiftHistoryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_lift_history(params: GetLiftHistoryInput) -> str:
     """Get history for a specific lift.
     
@@ -1515,21 +2095,14 @@ async def fitness_get_lift_history(params: GetLiftHistoryInput) -> str:
         cursor = conn.cursor()
         
         # Get lift history from workouts
-        cursor.execute("""
-            SELECT date, result_display, notes, is_pr, set_details
-            FROM workouts
-            WHERE barbell_lift LIKE ?
-            ORDER BY date DESC
-            LIMIT ?
-        """, (f"%{params.lift_name}%", params.limit))
+        cursor.execute(LIFT_HISTORY_SQL, (f"%{params.lift_name}%", params.limit))
         
         history = cursor.fetchall()
+        # Column names once, for the JSON branch; zip beats dict(Row) per row
+        history_columns = [d[0] for d in cursor.description]
         
         # Get PR
-        cursor.execute("""
-            SELECT MAX(weight) as pr, date FROM lift_prs
-            WHERE lift_name LIKE ?
-        """, (f"%{params.lift_name}%",))
+        cursor.execute(LIFT_PR_SQL, (f"%{params.lift_name}%",))
         
         pr_row = cursor.fetchone()
     
@@ -1537,24 +2110,24 @@ async def fitness_get_lift_history(params: GetLiftHistoryInput) -> str:
         return json.dumps({
             "lift": params.lift_name,
             "pr": pr_row['pr'] if pr_row else None,
-            "history": [dict(h) for h in history]
-        }, indent=2)
+            "history": [dict(zip(history_columns, h)) for h in history]
+        }, separators=(",", ":"))
     
-    result = f"## {params.lift_name} History\n\n"
+    parts = [f"## {params.lift_name} History\n\n"]
     
     if pr_row and pr_row['pr']:
-        result += f"**Current PR: {pr_row['pr']} lbs**\n\n"
+        parts.append(f"**Current PR: {pr_row['pr']} lbs**\n\n")
     
     if history:
-        result += "| Date | Weight | Notes |\n|------|--------|-------|\n"
+        parts.append("| Date | Weight | Notes |\n|------|--------|-------|\n")
         for h in history:
             pr_marker = " 🏆" if h['is_pr'] else ""
             notes = (h['notes'] or "")[:30]
-            result += f"| {h['date']} | {h['result_display']} lbs{pr_marker} | {notes} |\n"
+            parts.append(f"| {h['date']} | {h['result_display']} lbs{pr_marker} | {notes} |\n")
     else:
-        result += "No history found for this lift.\n"
+        parts.append("No history found for this lift.\n")
     
-    return result
+    return "".join(parts)
 
 
 class GetPRsInput(BaseModel):
@@ -1574,6 +2147,7 @@ class GetPRsInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_prs(params: GetPRsInput) -> str:
     """Get all personal records.
     
@@ -1588,33 +2162,35 @@ async def fitness_get_prs(params: GetPRsInput) -> str:
     with get_db() as conn:
         cursor = conn.cursor()
         
+        # Best weight per lift in one pass over idx_lift_prs_best. Ties go
+        # to the earliest date: that's when the PR was actually set.
         cursor.execute("""
-            SELECT lp.lift_name, lp.weight as pr, lp.date
-            FROM lift_prs lp
-            INNER JOIN (
-                SELECT lift_name, MAX(weight) as max_weight
+            SELECT lift_name, weight as pr, date FROM (
+                SELECT lift_name, weight, date, ROW_NUMBER() OVER (
+                    PARTITION BY lift_name ORDER BY weight DESC, date
+                ) AS rn
                 FROM lift_prs
-                GROUP BY lift_name
-            ) max_prs ON lp.lift_name = max_prs.lift_name AND lp.weight = max_prs.max_weight
-            GROUP BY lp.lift_name
-            ORDER BY lp.lift_name
+            )
+            WHERE rn = 1
+            ORDER BY lift_name
         """)
         
         prs = cursor.fetchall()
+        columns = [d[0] for d in cursor.description]
     
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps([dict(p) for p in prs], indent=2)
+        return json.dumps([dict(zip(columns, p)) for p in prs], separators=(",", ":"))
     
-    result = "## 🏆 Personal Records\n\n"
+    parts = ["## 🏆 Personal Records\n\n"]
     
     if prs:
-        result += "| Lift | PR | Date |\n|------|-----|------|\n"
+        parts.append("| Lift | PR | Date |\n|------|-----|------|\n")
         for p in prs:
-            result += f"| {p['lift_name']} | {p['pr']} lbs | {p['date']} |\n"
+            parts.append(f"| {p['lift_name']} | {p['pr']} lbs | {p['date']} |\n")
     else:
-        result += "No PRs recorded yet. Start lifting!\n"
+        parts.append("No PRs recorded yet. Start lifting!\n")
     
-    return result
+    return "".join(parts)
 
 
 class WeeklyReviewInput(BaseModel):
@@ -1624,6 +2200,52 @@ class WeeklyReviewInput(BaseModel):
     weeks_back: int = Field(default=1, description="How many weeks back to review", ge=1, le=12)
 
 
+# Every weekly_review aggregate in one statement. Each CTE reduces its table
+# to a single row over the window, so the final SELECT is a one-row join.
+# The new PRs come back as a JSON array of [lift_name, weight, date].
+WEEKLY_REVIEW_SQL = """
+    WITH
+    wk AS (
+        SELECT COUNT(*) AS workout_count FROM workouts
+        WHERE date >= :start AND date <= :end
+    ),
+    pr AS (
+        SELECT COUNT(*) AS protein_days,
+               SUM(grams >= :target) AS protein_days_hit,
+               AVG(grams) AS protein_avg
+        FROM protein_log
+        WHERE date >= :start AND date <= :end
+    ),
+    wt AS (
+        SELECT
+            (SELECT weight FROM weight_log WHERE date >= :start AND date <= :end
+             ORDER BY date LIMIT 1) AS first_weight,
+            (SELECT weight FROM weight_log WHERE date >= :start AND date <= :end
+             ORDER BY date DESC LIMIT 1) AS last_weight
+    ),
+    rd AS (
+        SELECT AVG(sleep_quality) AS avg_sleep, AVG(energy) AS avg_energy,
+               AVG(soreness) AS avg_soreness, AVG(stress) AS avg_stress
+        FROM readiness_log
+        WHERE date >= :start AND date <= :end
+    ),
+    mb AS (
+        SELECT COUNT(*) AS mobility_sessions, SUM(duration_minutes) AS mobility_total
+        FROM mobility_log
+        WHERE date >= :start AND date <= :end
+    ),
+    np AS (
+        SELECT json_group_array(json_array(lift_name, weight, date)) AS recent_prs
+        FROM (
+            SELECT lift_name, weight, date FROM lift_prs
+            WHERE date >= :start AND date <= :end
+            ORDER BY date DESC
+        )
+    )
+    SELECT * FROM wk, pr, wt, rd, mb, np
+"""
+
+
 @mcp.tool(
     name="fitness_weekly_review",
     annotations={
@@ -1634,6 +2256,7 @@ class WeeklyReviewInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_weekly_review(params: WeeklyReviewInput) -> str:
     """Generate a weekly training review.
     
@@ -1648,115 +2271,73 @@ async def fitness_weekly_review(params: WeeklyReviewInput) -> str:
     end_date = date.today()
     start_date = end_date - timedelta(weeks=params.weeks_back)
     
+    protein_target = 160
+    
     with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Workout count
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM workouts
-            WHERE date >= ? AND date <= ?
-        """, (start_date.isoformat(), end_date.isoformat()))
-        workout_count = cursor.fetchone()['count']
-        
-        # Protein adherence
-        cursor.execute("""
-            SELECT date, grams FROM protein_log
-            WHERE date >= ? AND date <= ?
-            ORDER BY date
-        """, (start_date.isoformat(), end_date.isoformat()))
-        protein_days = cursor.fetchall()
-        
-        # Weight trend
-        cursor.execute("""
-            SELECT date, weight FROM weight_log
-            WHERE date >= ? AND date <= ?
-            ORDER BY date
-        """, (start_date.isoformat(), end_date.isoformat()))
-        weights = cursor.fetchall()
-        
-        # Readiness average
-        cursor.execute("""
-            SELECT AVG(sleep_quality) as sleep, AVG(energy) as energy,
-                   AVG(soreness) as soreness, AVG(stress) as stress
-            FROM readiness_log
-            WHERE date >= ? AND date <= ?
-        """, (start_date.isoformat(), end_date.isoformat()))
-        readiness_avg = cursor.fetchone()
-        
-        # Mobility
-        cursor.execute("""
-            SELECT COUNT(*) as sessions, SUM(duration_minutes) as total
-            FROM mobility_log
-            WHERE date >= ? AND date <= ?
-        """, (start_date.isoformat(), end_date.isoformat()))
-        mobility = cursor.fetchone()
-        
-        # Recent PRs
-        cursor.execute("""
-            SELECT lift_name, weight, date FROM lift_prs
-            WHERE date >= ? AND date <= ?
-            ORDER BY date DESC
-        """, (start_date.isoformat(), end_date.isoformat()))
-        recent_prs = cursor.fetchall()
+        review = conn.execute(WEEKLY_REVIEW_SQL, {
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat(),
+            "target": protein_target,
+        }).fetchone()
+    
+    workout_count = review['workout_count']
+    recent_prs = json.loads(review['recent_prs'])
     
-    result = f"## Weekly Review: {start_date} to {end_date}\n\n"
+    parts = [f"## Weekly Review: {start_date} to {end_date}\n\n"]
     
     # Workouts
-    result += f"### 💪 Training\n"
-    result += f"- **Workouts completed:** {workout_count}\n"
+    parts.append("### 💪 Training\n")
+    parts.append(f"- **Workouts completed:** {workout_count}\n")
     if workout_count >= 4:
-        result += "  ✅ Great consistency!\n"
+        parts.append("  ✅ Great consistency!\n")
     elif workout_count >= 2:
-        result += "  ⚠️ Room for improvement\n"
+        parts.append("  ⚠️ Room for improvement\n")
     else:
-        result += "  ❌ Need more sessions\n"
+        parts.append("  ❌ Need more sessions\n")
     
     # Protein
-    result += f"\n### 🥩 Protein\n"
-    if protein_days:
-        protein_target = 160
-        days_hit = sum(1 for p in protein_days if p['grams'] >= protein_target)
-        avg_protein = sum(p['grams'] for p in protein_days) / len(protein_days)
-        result += f"- **Days logged:** {len(protein_days)}\n"
-        result += f"- **Days hitting 160g+:** {days_hit}\n"
-        result += f"- **Average:** {avg_protein:.0f}g/day\n"
+    parts.append("\n### 🥩 Protein\n")
+    if review['protein_days']:
+        parts.append(f"- **Days logged:** {review['protein_days']}\n")
+        parts.append(f"- **Days hitting 160g+:** {review['protein_days_hit']}\n")
+        parts.append(f"- **Average:** {review['protein_avg']:.0f}g/day\n")
     else:
-        result += "- No protein logged this week\n"
+        parts.append("- No protein logged this week\n")
     
     # Weight
-    result += f"\n### ⚖️ Weight\n"
-    if weights:
-        first_weight = weights[0]['weight']
-        last_weight = weights[-1]['weight']
+    parts.append("\n### ⚖️ Weight\n")
+    if review['first_weight'] is not None:
+        first_weight = review['first_weight']
+        last_weight = review['last_weight']
         diff = last_weight - first_weight
-        result += f"- **Start:** {first_weight} lbs\n"
-        result += f"- **End:** {last_weight} lbs\n"
-        result += f"- **Change:** {'+' if diff > 0 else ''}{diff:.1f} lbs\n"
+        parts.append(f"- **Start:** {first_weight} lbs\n")
+        parts.append(f"- **End:** {last_weight} lbs\n")
+        parts.append(f"- **Change:** {'+' if diff > 0 else ''}{diff:.1f} lbs\n")
     else:
-        result += "- No weight logged this week\n"
+        parts.append("- No weight logged this week\n")
     
     # Readiness
-    result += f"\n### 😴 Recovery (averages)\n"
-    if readiness_avg and readiness_avg['sleep']:
-        result += f"- Sleep: {readiness_avg['sleep']:.1f}/5\n"
-        result += f"- Energy: {readiness_avg['energy']:.1f}/5\n"
-        result += f"- Soreness: {readiness_avg['soreness']:.1f}/5\n"
-        result += f"- Stress: {readiness_avg['stress']:.1f}/5\n"
+    parts.append("\n### 😴 Recovery (averages)\n")
+    if review['avg_sleep']:
+        parts.append(f"- Sleep: {review['avg_sleep']:.1f}/5\n")
+        parts.append(f"- Energy: {review['avg_energy']:.1f}/5\n")
+        parts.append(f"- Soreness: {review['avg_soreness']:.1f}/5\n")
+        parts.append(f"- Stress: {review['avg_stress']:.1f}/5\n")
     else:
-        result += "- No readiness check-ins this week\n"
+        parts.append("- No readiness check-ins this week\n")
     
     # Mobility
-    result += f"\n### 🧘 Mobility\n"
-    result += f"- **Sessions:** {mobility['sessions'] or 0}\n"
-    result += f"- **Total time:** {mobility['total'] or 0} minutes\n"
+    parts.append("\n### 🧘 Mobility\n")
+    parts.append(f"- **Sessions:** {review['mobility_sessions'] or 0}\n")
+    parts.append(f"- **Total time:** {review['mobility_total'] or 0} minutes\n")
     
     # PRs
     if recent_prs:
-        result += f"\n### 🏆 New PRs!\n"
-        for pr in recent_prs:
-            result += f"- {pr['lift_name']}: {pr['weight']} lbs ({pr['date']})\n"
+        parts.append("\n### 🏆 New PRs!\n")
+        for lift_name, weight, pr_date in recent_prs:
+            parts.append(f"- {lift_name}: {weight} lbs ({pr_date})\n")
     
-    return result
+    return "".join(parts)
 
 
 class GetSummaryInput(BaseModel):
@@ -1764,6 +2345,26 @@ class GetSummaryInput(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
 
 
+# Everything the dashboard shows, in one row. Same shape as TODAY_SQL: the
+# optional rows are LEFT JOINed onto a dummy row and come back as NULLs.
+SUMMARY_SQL = """
+    SELECT
+        (SELECT grams FROM protein_log WHERE date = :today) AS protein_grams,
+        (SELECT COUNT(*) FROM workouts WHERE date >= :week_ago) AS week_workouts,
+        w.weight AS latest_weight, w.date AS latest_weight_date,
+        r.id AS readiness_id, r.sleep_quality, r.energy, r.soreness, r.stress,
+        p.name AS program_name, p.start_date AS program_start
+    FROM (SELECT 1)
+    LEFT JOIN (
+        SELECT weight, date FROM weight_log ORDER BY date DESC LIMIT 1
+    ) AS w
+    LEFT JOIN readiness_log AS r ON r.date = :today
+    LEFT JOIN (
+        SELECT name, start_date FROM programs WHERE is_active = TRUE LIMIT 1
+    ) AS p
+"""
+
+
 @mcp.tool(
     name="fitness_get_summary",
     annotations={
@@ -1774,6 +2375,7 @@ class GetSummaryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_summary(params: GetSummaryInput) -> str:
     """Get a quick dashboard summary.
     
@@ -1789,56 +2391,35 @@ async def fitness_get_summary(params: GetSummaryInput) -> str:
     week_ago = (date.today() - timedelta(days=7)).isoformat()
     
     with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Today's protein
-        cursor.execute("SELECT grams FROM protein_log WHERE date = ?", (today,))
-        protein = cursor.fetchone()
-        
-        # This week's workouts
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM workouts WHERE date >= ?
-        """, (week_ago,))
-        week_workouts = cursor.fetchone()['count']
-        
-        # Latest weight
-        cursor.execute("""
-            SELECT weight, date FROM weight_log ORDER BY date DESC LIMIT 1
-        """)
-        latest_weight = cursor.fetchone()
-        
-        # Today's readiness
-        cursor.execute("SELECT * FROM readiness_log WHERE date = ?", (today,))
-        readiness = cursor.fetchone()
-        
-        # Active program
-        cursor.execute("SELECT name, start_date FROM programs WHERE is_active = TRUE LIMIT 1")
-        program = cursor.fetchone()
+        summary = conn.execute(SUMMARY_SQL, {"today": today, "week_ago": week_ago}).fetchone()
+    
+    readiness = summary if summary['readiness_id'] is not None else None
     
     result = f"## Fitness Dashboard: {today}\n\n"
     
     # Program status
-    if program:
-        result += f"📋 **Program:** {program['name']} (started {program['start_date']})\n\n"
+    if summary['program_name'] is not None:
+        result += f"📋 **Program:** {summary['program_name']} (started {summary['program_start']})\n\n"
     else:
         result += "📋 **No active program** - use `fitness_set_program` to start\n\n"
     
     # Quick stats
     result += "### Today\n"
-    result += f"- Protein: {protein['grams'] if protein else 0}g / 160g\n"
+    result += f"- Protein: {summary['protein_grams'] or 0}g / 160g\n"
     
     if readiness:
-        score = (readiness['sleep_quality'] + readiness['energy'] + 
-                (6 - readiness['soreness']) + (6 - readiness['stress'])) / 4
+        score = readiness_score(
+            readiness['sleep_quality'], readiness['energy'], readiness['soreness'], readiness['stress'],
+        )
         result += f"- Readiness: {score:.1f}/5\n"
     else:
         result += "- Readiness: not logged\n"
     
     result += f"\n### This Week\n"
-    result += f"- Workouts: {week_workouts}\n"
+    result += f"- Workouts: {summary['week_workouts']}\n"
     
-    if latest_weight:
-        result += f"- Latest weight: {latest_weight['weight']} lbs ({latest_weight['date']})\n"
+    if summary['latest_weight_date'] is not None:
+        result += f"- Latest weight: {summary['latest_weight']} lbs ({summary['latest_weight_date']})\n"
     
     return result
 
@@ -1855,6 +2436,17 @@ class GetReadinessHistoryInput(BaseModel):
     response_format: ResponseFormat = Field(default=ResponseFormat.JSON)
 
 
+READINESS_HISTORY_SQL = """
+    SELECT date, sleep_quality, energy, soreness, stress, notes
+    FROM readiness_log
+    WHERE date >= ?
+    ORDER BY date ASC
+"""
+READINESS_HISTORY_JSON_SQL = json_rows_sql(READINESS_HISTORY_SQL, (
+    "date", "sleep_quality", "energy", "soreness", "stress", "notes",
+))
+
+
 @mcp.tool(
     name="fitness_get_readiness_history",
     annotations={
@@ -1865,6 +2457,7 @@ class GetReadinessHistoryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_readiness_history(params: GetReadinessHistoryInput) -> str:
     """Get readiness check-in history.
     
@@ -1879,31 +2472,25 @@ async def fitness_get_readiness_history(params: GetReadinessHistoryInput) -> str
     """
     start_date = (date.today() - timedelta(days=params.days_back)).isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT date, sleep_quality, energy, soreness, stress, notes
-            FROM readiness_log
-            WHERE date >= ?
-            ORDER BY date ASC
-        """, (start_date,))
-        rows = cursor.fetchall()
-    
-    data = [dict(row) for row in rows]
-    
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(data, indent=2)
+        # SQLite serializes the rows itself; no per-row dicts in Python
+        with get_db() as conn:
+            return conn.execute(READINESS_HISTORY_JSON_SQL, (start_date,)).fetchone()[0]
+    
+    parts = [
+        "## Readiness History\n\n",
+        "| Date | Sleep | Energy | Soreness | Stress |\n",
+        "|------|-------|--------|----------|--------|\n",
+    ]
+    with get_db() as conn:
+        # Rows go straight from the cursor into the table, no fetchall() list
+        for r in conn.execute(READINESS_HISTORY_SQL, (start_date,)):
+            parts.append(f"| {r['date']} | {r['sleep_quality']} | {r['energy']} | {r['soreness']} | {r['stress']} |\n")
     
-    if not data:
+    if len(parts) == 3:
         return "No readiness data found for this period."
     
-    result = "## Readiness History\n\n"
-    result += "| Date | Sleep | Energy | Soreness | Stress |\n"
-    result += "|------|-------|--------|----------|--------|\n"
-    for r in data:
-        result += f"| {r['date']} | {r['sleep_quality']} | {r['energy']} | {r['soreness']} | {r['stress']} |\n"
-    
-    return result
+    return "".join(parts)
 
 
 class GetProteinHistoryInput(BaseModel):
@@ -1914,6 +2501,17 @@ class GetProteinHistoryInput(BaseModel):
     response_format: ResponseFormat = Field(default=ResponseFormat.JSON)
 
 
+PROTEIN_HISTORY_SQL = """
+    SELECT date, grams, notes
+    FROM protein_log
+    WHERE date >= ?
+    ORDER BY date ASC
+"""
+PROTEIN_HISTORY_JSON_SQL = json_rows_sql(PROTEIN_HISTORY_SQL, (
+    "date", "grams", "notes",
+))
+
+
 @mcp.tool(
     name="fitness_get_protein_history",
     annotations={
@@ -1924,6 +2522,7 @@ class GetProteinHistoryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_protein_history(params: GetProteinHistoryInput) -> str:
     """Get protein intake history.
     
@@ -1937,32 +2536,25 @@ async def fitness_get_protein_history(params: GetProteinHistoryInput) -> str:
     """
     start_date = (date.today() - timedelta(days=params.days_back)).isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT date, grams, notes
-            FROM protein_log
-            WHERE date >= ?
-            ORDER BY date ASC
-        """, (start_date,))
-        rows = cursor.fetchall()
-    
-    data = [dict(row) for row in rows]
-    
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(data, indent=2)
+        # SQLite serializes the rows itself; no per-row dicts in Python
+        with get_db() as conn:
+            return conn.execute(PROTEIN_HISTORY_JSON_SQL, (start_date,)).fetchone()[0]
+    
+    parts = [
+        "## Protein History\n\n",
+        "| Date | Grams | Notes |\n",
+        "|------|-------|-------|\n",
+    ]
+    with get_db() as conn:
+        for r in conn.execute(PROTEIN_HISTORY_SQL, (start_date,)):
+            notes = (r['notes'] or "")[:40]
+            parts.append(f"| {r['date']} | {r['grams']}g | {notes} |\n")
     
-    if not data:
+    if len(parts) == 3:
         return "No protein data found for this period."
     
-    result = "## Protein History\n\n"
-    result += "| Date | Grams | Notes |\n"
-    result += "|------|-------|-------|\n"
-    for r in data:
-        notes = (r['notes'] or "")[:40]
-        result += f"| {r['date']} | {r['grams']}g | {notes} |\n"
-    
-    return result
+    return "".join(parts)
 
 
 class GetWeightHistoryInput(BaseModel):
@@ -1973,6 +2565,17 @@ class GetWeightHistoryInput(BaseModel):
     response_format: ResponseFormat = Field(default=ResponseFormat.JSON)
 
 
+WEIGHT_HISTORY_SQL = """
+    SELECT date, weight, notes
+    FROM weight_log
+    WHERE date >= ?
+    ORDER BY date ASC
+"""
+WEIGHT_HISTORY_JSON_SQL = json_rows_sql(WEIGHT_HISTORY_SQL, (
+    "date", "weight", "notes",
+))
+
+
 @mcp.tool(
     name="fitness_get_weight_history",
     annotations={
@@ -1983,6 +2586,7 @@ class GetWeightHistoryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_weight_history(params: GetWeightHistoryInput) -> str:
     """Get body weight history.
     
@@ -1996,31 +2600,24 @@ async def fitness_get_weight_history(params: GetWeightHistoryInput) -> str:
     """
     start_date = (date.today() - timedelta(days=params.days_back)).isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT date, weight, notes
-            FROM weight_log
-            WHERE date >= ?
-            ORDER BY date ASC
-        """, (start_date,))
-        rows = cursor.fetchall()
-    
-    data = [dict(row) for row in rows]
-    
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(data, indent=2)
+        # SQLite serializes the rows itself; no per-row dicts in Python
+        with get_db() as conn:
+            return conn.execute(WEIGHT_HISTORY_JSON_SQL, (start_date,)).fetchone()[0]
+    
+    parts = [
+        "## Weight History\n\n",
+        "| Date | Weight (lbs) |\n",
+        "|------|-------------|\n",
+    ]
+    with get_db() as conn:
+        for r in conn.execute(WEIGHT_HISTORY_SQL, (start_date,)):
+            parts.append(f"| {r['date']} | {r['weight']} |\n")
     
-    if not data:
+    if len(parts) == 3:
         return "No weight data found for this period."
     
-    result = "## Weight History\n\n"
-    result += "| Date | Weight (lbs) |\n"
-    result += "|------|-------------|\n"
-    for r in data:
-        result += f"| {r['date']} | {r['weight']} |\n"
-    
-    return result
+    return "".join(parts)
 
 
 class GetWorkoutHistoryInput(BaseModel):
@@ -2031,6 +2628,19 @@ class GetWorkoutHistoryInput(BaseModel):
     response_format: ResponseFormat = Field(default=ResponseFormat.JSON)
 
 
+WORKOUT_HISTORY_SQL = """
+    SELECT id, date, title, description, score_type, result_display,
+           barbell_lift, notes, rx_or_scaled, is_pr, source
+    FROM workouts
+    WHERE date >= ?
+    ORDER BY date ASC, id ASC
+"""
+WORKOUT_HISTORY_JSON_SQL = json_rows_sql(WORKOUT_HISTORY_SQL, (
+    "id", "date", "title", "description", "score_type", "result_display",
+    "barbell_lift", "notes", "rx_or_scaled", "is_pr", "source",
+))
+
+
 @mcp.tool(
     name="fitness_get_workout_history",
     annotations={
@@ -2041,6 +2651,7 @@ class GetWorkoutHistoryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_workout_history(params: GetWorkoutHistoryInput) -> str:
     """Get workout history.
     
@@ -2054,32 +2665,24 @@ async def fitness_get_workout_history(params: GetWorkoutHistoryInput) -> str:
     """
     start_date = (date.today() - timedelta(days=params.days_back)).isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, date, title, description, score_type, result_display, 
-                   barbell_lift, notes, rx_or_scaled, is_pr, source
-            FROM workouts
-            WHERE date >= ?
-            ORDER BY date ASC, id ASC
-        """, (start_date,))
-        rows = cursor.fetchall()
-    
-    data = [dict(row) for row in rows]
-    
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(data, indent=2)
+        # SQLite serializes the rows itself; no per-row dicts in Python
+        with get_db() as conn:
+            return conn.execute(WORKOUT_HISTORY_JSON_SQL, (start_date,)).fetchone()[0]
+    
+    parts = [
+        "## Workout History\n\n",
+        "| Date | Workout | Result |\n",
+        "|------|---------|--------|\n",
+    ]
+    with get_db() as conn:
+        for r in conn.execute(WORKOUT_HISTORY_SQL, (start_date,)):
+            parts.append(f"| {r['date']} | {r['title']} | {r['result_display'] or '-'} |\n")
     
-    if not data:
+    if len(parts) == 3:
         return "No workouts found for this period."
     
-    result = "## Workout History\n\n"
-    result += "| Date | Workout | Result |\n"
-    result += "|------|---------|--------|\n"
-    for r in data:
-        result += f"| {r['date']} | {r['title']} | {r['result_display'] or '-'} |\n"
-    
-    return result
+    return "".join(parts)
 
 
 class GetMobilityHistoryInput(BaseModel):
@@ -2090,6 +2693,17 @@ class GetMobilityHistoryInput(BaseModel):
     response_format: ResponseFormat = Field(default=ResponseFormat.JSON)
 
 
+MOBILITY_HISTORY_SQL = """
+    SELECT date, duration_minutes, focus_area, exercises, notes
+    FROM mobility_log
+    WHERE date >= ?
+    ORDER BY date ASC
+"""
+MOBILITY_HISTORY_JSON_SQL = json_rows_sql(MOBILITY_HISTORY_SQL, (
+    "date", "duration_minutes", "focus_area", "exercises", "notes",
+))
+
+
 @mcp.tool(
     name="fitness_get_mobility_history",
     annotations={
@@ -2100,6 +2714,7 @@ class GetMobilityHistoryInput(BaseModel):
         "openWorldHint": False
     }
 )
+@cached_read
 async def fitness_get_mobility_history(params: GetMobilityHistoryInput) -> str:
     """Get mobility work history.
     
@@ -2113,32 +2728,25 @@ async def fitness_get_mobility_history(params: GetMobilityHistoryInput) -> str:
     """
     start_date = (date.today() - timedelta(days=params.days_back)).isoformat()
     
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT date, duration_minutes, focus_area, exercises, notes
-            FROM mobility_log
-            WHERE date >= ?
-            ORDER BY date ASC
-        """, (start_date,))
-        rows = cursor.fetchall()
-    
-    data = [dict(row) for row in rows]
-    
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(data, indent=2)
+        # SQLite serializes the rows itself; no per-row dicts in Python
+        with get_db() as conn:
+            return conn.execute(MOBILITY_HISTORY_JSON_SQL, (start_date,)).fetchone()[0]
+    
+    parts = [
+        "## Mobility History\n\n",
+        "| Date | Duration | Focus | Exercises |\n",
+        "|------|----------|-------|----------|\n",
+    ]
+    with get_db() as conn:
+        for r in conn.execute(MOBILITY_HISTORY_SQL, (start_date,)):
+            exercises = (r['exercises'] or "")[:30]
+            parts.append(f"| {r['date']} | {r['duration_minutes']} min | {r['focus_area'] or '-'} | {exercises} |\n")
     
-    if not data:
+    if len(parts) == 3:
         return "No mobility data found for this period."
     
-    result = "## Mobility History\n\n"
-    result += "| Date | Duration | Focus | Exercises |\n"
-    result += "|------|----------|-------|----------|\n"
-    for r in data:
-        exercises = (r['exercises'] or "")[:30]
-        result += f"| {r['date']} | {r['duration_minutes']} min | {r['focus_area'] or '-'} | {exercises} |\n"
-    
-    return result
+    return "".join(parts)
 
 
 # ============================================================================
@@ -2186,6 +2794,16 @@ PROTEIN_ESTIMATES = {
     "quinoa": 8,
 }
 
+# One pass over the description: an optional quantity prefix, then a food
+# name. Longer names come first in the alternation so "chicken breast" or
+# "eggs" wins over "chicken" or "egg" at the same spot. Names must be whole
+# words (a plural s/es is allowed), so "egg" doesn't fire inside "eggplant".
+_PROTEIN_RE = re.compile(
+    r'(?:(\d+)\s*(?:oz|ounce|piece|slice|cup|scoop|serving)?s?\s*(?:of\s+)?)?\b('
+    + '|'.join(re.escape(food) for food in sorted(PROTEIN_ESTIMATES, key=len, reverse=True))
+    + r')(?:e?s)?\b'
+)
+
 
 @mcp.tool(
     name="fitness_estimate_protein",
@@ -2213,24 +2831,26 @@ async def fitness_estimate_protein(params: EstimateProteinInput) -> str:
     
     total = 0
     found_items = []
-    
-    for food, protein in PROTEIN_ESTIMATES.items():
-        if food in description:
-            # Check for quantities
-            quantity = 1
-            
-            # Look for numbers before the food item
-            pattern = rf'(\d+)\s*(?:oz|ounce|piece|slice|cup|scoop|serving)?s?\s*(?:of\s+)?{food}'
-            match = re.search(pattern, description)
-            if match:
-                quantity = int(match.group(1))
-                # Adjust for oz if applicable (assume standard serving is ~4oz for meats)
-                if 'oz' in description or 'ounce' in description:
-                    quantity = quantity / 4
-            
-            item_protein = int(protein * quantity)
-            total += item_protein
-            found_items.append(f"{food}: ~{item_protein}g")
+    seen = set()
+    # Adjust for oz if applicable (assume standard serving is ~4oz for meats)
+    in_ounces = 'oz' in description or 'ounce' in description
+    
+    for match in _PROTEIN_RE.finditer(description):
+        qty, food = match.groups()
+        # Count each food once, using its first mention
+        if food in seen:
+            continue
+        seen.add(food)
+        
+        quantity = 1
+        if qty:
+            quantity = int(qty)
+            if in_ounces:
+                quantity = quantity / 4
+        
+        item_protein = int(PROTEIN_ESTIMATES[food] * quantity)
+        total += item_protein
+        found_items.append(f"{food}: ~{item_protein}g")
     
     if not found_items:
         return f"I couldn't identify specific foods in '{params.food_description}'. Can you be more specific about the protein sources (e.g., chicken, eggs, greek yogurt)?"
@@ -2253,6 +2873,26 @@ async def fitness_estimate_protein(params: EstimateProteinInput) -> str:
 # ============================================================================
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+# Google's cap on requests per batch call
+CALENDAR_BATCH_SIZE = 50
+# Rate-limited calls are retried with exponential backoff, up to this many
+# attempts in total. A 403 only counts as a rate limit when its reason says
+# so; any other 403 is a real permission error.
+CALENDAR_MAX_ATTEMPTS = 5
+RETRYABLE_STATUSES = {429, 500, 503}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded"}
+CALENDAR_TIMEZONE = 'America/New_York'
+# fitness_sync_calendar books every workout 10am-12pm, with a popup an hour
+# before. SYNC_REMINDERS is shared by every event body; the client only
+# serializes it, so it must never be mutated.
+SYNC_EVENT_START = time(10, 0)
+SYNC_EVENT_END = time(12, 0)
+SYNC_REMINDERS = {
+    'useDefault': False,
+    'overrides': [
+        {'method': 'popup', 'minutes': 60},
+    ],
+}
 CREDENTIALS_PATH = os.environ.get(
     "GOOGLE_CREDENTIALS_PATH",
     os.path.expanduser("~/fitness_mcp/credentials.json"),
@@ -2262,63 +2902,225 @@ TOKEN_PATH = os.environ.get(
     os.path.expanduser("~/fitness_mcp/token.json"),
 )
 
+# Shared by the sync and create-event tools
+_CALENDAR_NOT_INSTALLED = "Error: Google Calendar libraries not installed. Run: pip install google-auth-oauthlib google-api-python-client"
+_CALENDAR_NOT_CONFIGURED = f"Error: Google Calendar not configured. Place credentials.json in {CREDENTIALS_PATH} and run fitness_setup_oauth"
+
+
+# (credentials, service) from the last get_calendar_service() call. The
+# service holds the credentials object itself, so refreshing those in place
+# keeps it usable; it is only rebuilt when the credentials are replaced.
+_calendar_cache: tuple = (None, None)
+# The tools call get_calendar_service() in a worker thread; one refresh at a time
+_calendar_lock = threading.Lock()
+
+
+def save_token(creds) -> None:
+    """Write token.json via a temp file, so a crash never leaves it truncated."""
+    tmp_path = TOKEN_PATH + ".tmp"
+    try:
+        with open(tmp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, TOKEN_PATH)
+    except OSError as e:
+        # The credentials in memory still work; only the next process re-auths
+        logger.warning("Could not save %s: %s", TOKEN_PATH, e)
+
 
 def get_calendar_service():
-    """Get authenticated Google Calendar service."""
+    """Get authenticated Google Calendar service (cached across calls).
+
+    Returns None until fitness_setup_oauth has produced a token; the
+    interactive OAuth flow never runs from here. May refresh the token over
+    the network or write token.json, so async callers run it with
+    asyncio.to_thread.
+    """
+    global _calendar_cache
     if not GOOGLE_CALENDAR_AVAILABLE:
         return None
     
-    creds = None
-    
-    if os.path.exists(TOKEN_PATH):
-        creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists(CREDENTIALS_PATH):
-                return None
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_local_server(port=0)
+    with _calendar_lock:
+        creds, service = _calendar_cache
+        if service is not None and creds.valid:
+            return service
         
-        with open(TOKEN_PATH, 'w') as token:
-            token.write(creds.to_json())
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+        
+        if creds is None and os.path.exists(TOKEN_PATH):
+            creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+        
+        if not creds or not creds.valid:
+            if not (creds and creds.expired and creds.refresh_token):
+                return None
+            creds.refresh(Request())
+            save_token(creds)
+        
+        if service is None:
+            # The discovery document bundled with the client library: no HTTP
+            # fetch and no discovery-cache file on build
+            service = build('calendar', 'v3', credentials=creds, cache_discovery=False, static_discovery=True)
+        _calendar_cache = (creds, service)
+        return service
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a Calendar API error is a transient rate limit or server error."""
+    from googleapiclient.errors import HttpError
+    
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status in RETRYABLE_STATUSES:
+        return True
+    if error.resp.status != 403:
+        return False
+    try:
+        reason = json.loads(error.content)['error']['errors'][0]['reason']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return False
+    return reason in RATE_LIMIT_REASONS
+
+
+def backoff_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1 (Retry-After wins)."""
+    retry_after = error.resp.get('retry-after', '')
+    if retry_after.isdigit():
+        return float(retry_after)
+    return min(64, 0.5 * 2 ** attempt + random.random())
+
+
+# The cached service shares one httplib2.Http, which isn't thread-safe, so
+# calls through it run one at a time (in a worker thread, off the event loop)
+_calendar_http_lock = threading.Lock()
+
+
+def _execute(request):
+    """Run a blocking googleapiclient request or batch. Call via to_thread."""
+    with _calendar_http_lock:
+        return request.execute()
+
+
+async def execute_with_backoff(request):
+    """Execute a Calendar API request, retrying rate-limited attempts."""
+    from googleapiclient.errors import HttpError
     
-    return build('calendar', 'v3', credentials=creds)
+    for attempt in range(CALENDAR_MAX_ATTEMPTS):
+        try:
+            return await asyncio.to_thread(_execute, request)
+        except HttpError as e:
+            if attempt == CALENDAR_MAX_ATTEMPTS - 1 or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(e, attempt))
+
 
+async def insert_events(service, calendar_id: str, events: List[dict]) -> List[tuple]:
+    """Insert events with batch requests, one round trip per CALENDAR_BATCH_SIZE.
 
-def format_workout_for_calendar(day_workout: dict, week_num: int, week_theme: str) -> str:
-    """Format workout details for calendar event description."""
-    description = f"Week {week_num}: {week_theme}\n\n"
+    Inserts that come back rate-limited are re-sent together after a backoff;
+    an insert whose client-set id already exists is re-sent as an update.
+    One failed insert doesn't stop the others: returns (event, error) for
+    every insert that failed for good, i.e. with a non-retryable error or
+    still rate-limited after CALENDAR_MAX_ATTEMPTS.
+    """
+    from googleapiclient.errors import HttpError
+    
+    # (event, update): events whose id already exists are re-sent as updates
+    pending = [(event, False) for event in events]
+    failures = []
+    for attempt in range(CALENDAR_MAX_ATTEMPTS):
+        failed = []
+        for i in range(0, len(pending), CALENDAR_BATCH_SIZE):
+            chunk = pending[i:i + CALENDAR_BATCH_SIZE]
+            
+            def on_insert(request_id, response, exception, chunk=chunk):
+                if exception is not None:
+                    failed.append((chunk[int(request_id)], exception))
+            
+            batch = service.new_batch_http_request(callback=on_insert)
+            for n, (event, update) in enumerate(chunk):
+                # fields='id': the response is discarded, so skip the full Event
+                if update:
+                    request = service.events().update(
+                        calendarId=calendar_id, eventId=event['id'], body=event,
+                        sendUpdates='none', fields='id',
+                    )
+                else:
+                    request = service.events().insert(
+                        calendarId=calendar_id, body=event, sendUpdates='none', fields='id',
+                    )
+                batch.add(request, request_id=str(n))
+            try:
+                await asyncio.to_thread(_execute, batch)
+            except HttpError as e:
+                # The batch call itself was rejected, so none of its inserts ran
+                failed.extend((item, e) for item in chunk)
+        
+        retry = []
+        backoff_error = None
+        for (event, update), error in failed:
+            if attempt == CALENDAR_MAX_ATTEMPTS - 1:
+                # Out of attempts, even for a 409 whose update would come next
+                failures.append((event, error))
+            elif not update and isinstance(error, HttpError) and error.resp.status == 409:
+                # Synced before under the same id: overwrite that event
+                retry.append((event, True))
+            elif not is_retryable(error):
+                failures.append((event, error))
+            else:
+                retry.append((event, update))
+                backoff_error = backoff_error or error
+        if not retry:
+            break
+        pending = retry
+        if backoff_error is not None:
+            await asyncio.sleep(backoff_delay(backoff_error, attempt))
+    
+    return failures
+
+
+def calendar_event_id(*key) -> str:
+    """Deterministic Calendar event id for key.
+
+    base32hex of a SHA-1, lowercased: 32 characters from a-v and 0-9, the
+    alphabet Google accepts for client-set ids.
+    """
+    digest = hashlib.sha1("|".join(map(str, key)).encode()).digest()
+    return base64.b32hexencode(digest).decode().lower()
+
+
+def format_workout_for_calendar(day_workout: dict) -> str:
+    """Format workout details for calendar event description.
+
+    The "Week N: theme" header is left to the caller, so one workout shared
+    by several weeks is only formatted once.
+    """
+    parts = []
     
     if day_workout.get('exercises'):
-        description += "EXERCISES:\n"
+        parts.append("EXERCISES:\n")
         for ex in day_workout['exercises']:
-            reps = ex.get('reps', '')
-            line = f"• {ex['name']}: {ex['sets']} x {reps}"
-            if ex.get('notes'):
-                line += f" - {ex['notes']}"
-            description += line + "\n"
+            notes = f" - {ex['notes']}" if ex.get('notes') else ""
+            parts.append(f"• {ex['name']}: {ex['sets']} x {ex.get('reps', '')}{notes}\n")
     
     if day_workout.get('conditioning'):
-        description += f"\nCONDITIONING:\n{day_workout['conditioning']}\n"
+        parts.append(f"\nCONDITIONING:\n{day_workout['conditioning']}\n")
     
     if day_workout.get('mobility'):
-        description += f"\nMOBILITY:\n{day_workout['mobility']}\n"
+        parts.append(f"\nMOBILITY:\n{day_workout['mobility']}\n")
     
-    description += "\n---\nLogged via Fitness MCP"
+    parts.append("\n---\nLogged via Fitness MCP")
     
-    return description
+    return "".join(parts)
 
 
 class SyncCalendarInput(BaseModel):
     """Input for syncing program to calendar."""
     model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
     
-    start_date: Optional[str] = Field(default=None, description="Start date (YYYY-MM-DD), defaults to program start")
+    start_date: Optional[str] = Field(default=None, description="Start date (YYYY-MM-DD), defaults to program start", pattern=ISO_DATE_PATTERN)
     calendar_id: str = Field(default="primary", description="Calendar ID to sync to")
-    attendees: Optional[List[str]] = Field(default=None, description="List of email addresses to invite")
+    attendees: Optional[List[EmailAddress]] = Field(default=None, description="List of email addresses to invite")
 
 
 @mcp.tool(
@@ -2327,15 +3129,18 @@ class SyncCalendarInput(BaseModel):
         "title": "Sync Program to Calendar",
         "readOnlyHint": False,
         "destructiveHint": False,
-        "idempotentHint": False,
+        "idempotentHint": True,
         "openWorldHint": True
     }
 )
 async def fitness_sync_calendar(params: SyncCalendarInput) -> str:
     """Sync the current training program to Google Calendar.
     
-    Creates calendar events for each workout day in the program.
-    Events are scheduled weekdays 10am-12pm.
+    Creates calendar events for each workout day in the program; a workout
+    repeated in consecutive weeks becomes one weekly recurring event.
+    Events are scheduled weekdays 10am-12pm. Re-running with the same start
+    date updates the events from the previous sync rather than adding more. Attendees are added without
+    invitation emails, which Google rate-limits aggressively.
     
     Args:
         params: SyncCalendarInput with optional start date
@@ -2344,84 +3149,117 @@ async def fitness_sync_calendar(params: SyncCalendarInput) -> str:
         str: Summary of created events
     """
     if not GOOGLE_CALENDAR_AVAILABLE:
-        return "Error: Google Calendar libraries not installed. Run: pip install google-auth-oauthlib google-api-python-client"
+        return _CALENDAR_NOT_INSTALLED
     
-    service = get_calendar_service()
+    service = await asyncio.to_thread(get_calendar_service)
     if not service:
-        return f"Error: Google Calendar not configured. Place credentials.json in {CREDENTIALS_PATH}"
+        return _CALENDAR_NOT_CONFIGURED
     
     # Get active program
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM programs WHERE is_active = TRUE LIMIT 1")
+        cursor.execute(
+            "SELECT id, program_data, start_date FROM programs WHERE is_active = TRUE LIMIT 1"
+        )
         program = cursor.fetchone()
     
     if not program:
         return "Error: No active program. Use fitness_set_program first."
     
-    program_data = json.loads(program['program_data'])
+    program_data, program_days = load_program_data(program['id'], program['program_data'])
     start_date = params.start_date or program['start_date']
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+    start_day = date.fromisoformat(start_date)
+    
+    weeks = program_data['weeks']
+    themes = [week_data.get('theme', f'Week {week_idx + 1}') for week_idx, week_data in enumerate(weeks)]
     
-    events_created = 0
+    # Shared by every event; the client serializes it per request
+    attendees = [{'email': email} for email in dict.fromkeys(params.attendees or ())]
     
-    # Iterate through 4 weeks
-    for week_idx, week_data in enumerate(program_data['weeks']):
-        week_num = week_idx + 1
-        week_theme = week_data.get('theme', f'Week {week_num}')
+    events = []
+    event_workouts = []  # workouts covered by each event, for the summary
+    # Formatted workouts by id(); weeks that repeat week 1 share its dicts
+    descriptions = {}
+    
+    # One slot per day of the first week. Consecutive weeks that share a
+    # slot's workout (weeks that repeat week 1) become a single weekly
+    # recurring event instead of one insert per week.
+    for day_offset in range(7):
+        first_date = start_day + timedelta(days=day_offset)
+        weekday = first_date.weekday()
         
-        # Get the days structure (some weeks reference week 1)
-        if isinstance(week_data.get('days'), dict):
-            days = week_data['days']
-        else:
-            days = program_data['weeks'][0]['days']
+        # Skip weekends
+        if weekday >= 5:
+            continue
         
-        # Schedule weekdays only
-        for day_offset in range(7):
-            current_date = start_dt + timedelta(weeks=week_idx, days=day_offset)
-            day_name = current_date.strftime("%A")
-            
-            # Skip weekends
-            if day_name in ["Saturday", "Sunday"]:
-                continue
-            
-            day_workout = days.get(day_name)
+        runs = []  # [first week_idx, last week_idx, day_workout]
+        for week_idx in range(len(weeks)):
+            day_workout = program_days.get((week_idx, DAY_NAMES[weekday]))
             if not day_workout or day_workout['name'] in ["Rest", "Rest or Light Mobility"]:
                 continue
+            if runs and runs[-1][2] is day_workout and runs[-1][1] == week_idx - 1:
+                runs[-1][1] = week_idx
+            else:
+                runs.append([week_idx, week_idx, day_workout])
+        
+        for first_week, last_week, day_workout in runs:
+            current_date = first_date + timedelta(weeks=first_week)
+            occurrences = last_week - first_week + 1
+            
+            description = descriptions.get(id(day_workout))
+            if description is None:
+                description = descriptions[id(day_workout)] = format_workout_for_calendar(day_workout)
+            header = "\n".join(f"Week {w + 1}: {themes[w]}" for w in range(first_week, last_week + 1))
             
             # Create event 10am-12pm
-            event_start = current_date.replace(hour=10, minute=0)
-            event_end = current_date.replace(hour=12, minute=0)
+            event_start = datetime.combine(current_date, SYNC_EVENT_START)
+            event_end = datetime.combine(current_date, SYNC_EVENT_END)
             
             event = {
                 'summary': f"💪 {day_workout['name']}",
-                'description': format_workout_for_calendar(day_workout, week_num, week_theme),
+                'description': f"{header}\n\n{description}",
                 'start': {
                     'dateTime': event_start.isoformat(),
-                    'timeZone': 'America/New_York',
+                    'timeZone': CALENDAR_TIMEZONE,
                 },
                 'end': {
                     'dateTime': event_end.isoformat(),
-                    'timeZone': 'America/New_York',
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'popup', 'minutes': 60},
-                    ],
+                    'timeZone': CALENDAR_TIMEZONE,
                 },
+                'reminders': SYNC_REMINDERS,
             }
             
-            if params.attendees:
-                event['attendees'] = [{'email': email} for email in params.attendees]
+            if occurrences > 1:
+                event['recurrence'] = [f"RRULE:FREQ=WEEKLY;COUNT={occurrences}"]
             
-            try:
-                service.events().insert(calendarId=params.calendar_id, body=event).execute()
-                events_created += 1
-            except Exception as e:
-                return f"Error creating event: {str(e)}"
+            # Same program, start date and slot -> same id, so a re-sync
+            # updates the events it created instead of duplicating them
+            event['id'] = calendar_event_id(program['id'], start_date, DAY_NAMES[weekday], first_week)
+            
+            if attendees:
+                event['attendees'] = attendees
+            
+            events.append(event)
+            event_workouts.append(occurrences)
+    
+    try:
+        failures = await insert_events(service, params.calendar_id, events)
+    except Exception as e:
+        return f"Error creating event: {str(e)}"
     
-    return f"✅ Synced program to Google Calendar!\n\n- **Events created:** {events_created}\n- **Start date:** {start_date}\n- **Schedule:** Weekdays 10am-12pm"
+    if failures and len(failures) == len(events):
+        return f"Error creating event: {str(failures[0][1])}"
+    
+    failed_ids = {id(event) for event, _ in failures}
+    workouts = sum(n for event, n in zip(events, event_workouts) if id(event) not in failed_ids)
+    result = f"✅ Synced program to Google Calendar!\n\n- **Events synced:** {len(events) - len(failures)} ({workouts} workouts, repeating weeks as weekly series)\n- **Start date:** {start_date}\n- **Schedule:** Weekdays 10am-12pm"
+    
+    if failures:
+        result += f"\n- **Failed:** {len(failures)} events\n"
+        for event, error in failures[:3]:
+            result += f"  - {event['start']['dateTime'][:10]} {event['summary']}: {str(error)}\n"
+    
+    return result
 
 
 class CreateCalendarEventInput(BaseModel):
@@ -2429,12 +3267,12 @@ class CreateCalendarEventInput(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
     
     title: str = Field(..., description="Event title", min_length=1)
-    date: str = Field(..., description="Event date (YYYY-MM-DD)")
+    date: str = Field(..., description="Event date (YYYY-MM-DD)", pattern=ISO_DATE_PATTERN)
     start_time: str = Field(default="10:00", description="Start time (HH:MM)")
     end_time: str = Field(default="12:00", description="End time (HH:MM)")
     description: Optional[str] = Field(default=None, description="Event description")
     calendar_id: str = Field(default="primary", description="Calendar ID")
-    attendees: Optional[List[str]] = Field(default=None, description="List of email addresses to invite")
+    attendees: Optional[List[EmailAddress]] = Field(default=None, description="List of email addresses to invite")
 
 
 @mcp.tool(
@@ -2450,6 +3288,8 @@ class CreateCalendarEventInput(BaseModel):
 async def fitness_create_calendar_event(params: CreateCalendarEventInput) -> str:
     """Create a single workout event in Google Calendar.
     
+    Attendees are added without invitation emails.
+    
     Args:
         params: CreateCalendarEventInput with event details
         
@@ -2457,37 +3297,42 @@ async def fitness_create_calendar_event(params: CreateCalendarEventInput) -> str
         str: Confirmation of created event
     """
     if not GOOGLE_CALENDAR_AVAILABLE:
-        return "Error: Google Calendar libraries not installed. Run: pip install google-auth-oauthlib google-api-python-client"
+        return _CALENDAR_NOT_INSTALLED
     
-    service = get_calendar_service()
+    service = await asyncio.to_thread(get_calendar_service)
     if not service:
-        return f"Error: Google Calendar not configured. Place credentials.json in {CREDENTIALS_PATH}"
+        return _CALENDAR_NOT_CONFIGURED
     
-    event_date = datetime.strptime(params.date, "%Y-%m-%d")
+    event_date = date.fromisoformat(params.date)
+    # Not time.fromisoformat: that rejects unpadded hours like 9:30
     start_hour, start_min = map(int, params.start_time.split(":"))
     end_hour, end_min = map(int, params.end_time.split(":"))
     
-    event_start = event_date.replace(hour=start_hour, minute=start_min)
-    event_end = event_date.replace(hour=end_hour, minute=end_min)
+    event_start = datetime.combine(event_date, time(start_hour, start_min))
+    event_end = datetime.combine(event_date, time(end_hour, end_min))
     
     event = {
         'summary': params.title,
         'description': params.description or "",
         'start': {
             'dateTime': event_start.isoformat(),
-            'timeZone': 'America/New_York',
+            'timeZone': CALENDAR_TIMEZONE,
         },
         'end': {
             'dateTime': event_end.isoformat(),
-            'timeZone': 'America/New_York',
+            'timeZone': CALENDAR_TIMEZONE,
         },
     }
     
     if params.attendees:
-        event['attendees'] = [{'email': email} for email in params.attendees]
+        event['attendees'] = [{'email': email} for email in dict.fromkeys(params.attendees)]
     
     try:
-        created_event = service.events().insert(calendarId=params.calendar_id, body=event).execute()
+        created_event = await execute_with_backoff(
+            service.events().insert(
+                calendarId=params.calendar_id, body=event, sendUpdates='none', fields='id',
+            )
+        )
         return f"✅ Created event: **{params.title}** on {params.date} ({params.start_time}-{params.end_time})"
     except Exception as e:
         return f"Error creating event: {str(e)}"
@@ -2515,11 +3360,87 @@ async def fitness_check_calendar_setup() -> str:
     if not os.path.exists(CREDENTIALS_PATH):
         return f"❌ credentials.json not found.\n\nPlace your Google OAuth credentials at:\n`{CREDENTIALS_PATH}`\n\nYou can copy this from your friendship-mcp folder."
     
-    service = get_calendar_service()
-    if service:
+    # Only inspect the credentials: no service build, no refresh round trip
+    creds = _calendar_cache[0]
+    if creds is None and os.path.exists(TOKEN_PATH):
+        from google.oauth2.credentials import Credentials
+        try:
+            creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+        except ValueError:
+            creds = None
+    
+    if creds and creds.valid:
         return "✅ Google Calendar is configured and ready!"
-    else:
-        return "❌ Could not authenticate with Google Calendar. Check your credentials."
+    if creds and creds.expired and creds.refresh_token:
+        return "✅ Google Calendar is configured and ready! (token refreshes on next use)"
+    return "❌ Not authorized with Google Calendar yet.\n\nRun `fitness_setup_oauth` to sign in."
+
+
+# fitness_setup_oauth needs a browser on this machine to reach the flow's
+# loopback redirect. The HTTP deploy (deploy/server.py) turns it off.
+INTERACTIVE_OAUTH = True
+# How long the flow waits for the browser redirect before giving up
+OAUTH_TIMEOUT_SECONDS = 300
+
+
+def _run_oauth_flow() -> bool:
+    """Run the browser OAuth flow and save the resulting token.
+
+    Returns False if nobody completed the sign-in within OAUTH_TIMEOUT_SECONDS.
+    """
+    global _calendar_cache
+    from google_auth_oauthlib.flow import InstalledAppFlow, WSGITimeoutError
+    
+    flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
+    try:
+        creds = flow.run_local_server(port=0, timeout_seconds=OAUTH_TIMEOUT_SECONDS)
+    except WSGITimeoutError:
+        return False
+    save_token(creds)
+    with _calendar_lock:
+        # get_calendar_service() builds a service for these on next use
+        _calendar_cache = (creds, None)
+    return True
+
+
+@mcp.tool(
+    name="fitness_setup_oauth",
+    annotations={
+        "title": "Authorize Google Calendar",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def fitness_setup_oauth() -> str:
+    """Sign in to Google Calendar (one-time setup).
+    
+    Opens a browser for the Google OAuth consent screen and waits for it to
+    finish, then saves the token the calendar tools use. Needs a machine
+    with a browser; for a remote deploy, run it locally and upload token.json.
+    
+    Returns:
+        str: Result of the authorization
+    """
+    if not INTERACTIVE_OAUTH:
+        return "Error: Google Calendar authorization needs a browser and can't run on this server. Run fitness_setup_oauth from the local stdio server and upload token.json."
+    
+    if not GOOGLE_CALENDAR_AVAILABLE:
+        return _CALENDAR_NOT_INSTALLED
+    
+    if not os.path.exists(CREDENTIALS_PATH):
+        return f"❌ credentials.json not found.\n\nPlace your Google OAuth credentials at:\n`{CREDENTIALS_PATH}`"
+    
+    try:
+        authorized = await asyncio.to_thread(_run_oauth_flow)
+    except Exception as e:
+        return f"Error during Google Calendar authorization: {str(e)}"
+    
+    if not authorized:
+        return f"Error: Google Calendar sign-in not completed within {OAUTH_TIMEOUT_SECONDS // 60} minutes. Run fitness_setup_oauth again to retry."
+    
+    return "✅ Google Calendar authorized! The calendar tools are ready to use."
 
 
 # ============================================================================
@@ -2527,4 +3448,11 @@ async def fitness_check_calendar_setup() -> str:
 # ============================================================================
 
 if __name__ == "__main__":
+    # Optional faster event loop for the stdio server. mcp.run() goes
+    # through anyio, which builds its loop from the installed policy.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     mcp.run()
@@ -0,0 +1,87 @@
+"""fitness_import_sugarwod against a temp DB."""
+
+import asyncio
+import csv
+import os
+import re
+import tempfile
+
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "fitness.db"))
+
+import fitness_mcp  # noqa: E402
+
+HEADER = [
+    "date", "title", "description", "score_type", "best_result_raw",
+    "best_result_display", "barbell_lift", "set_details", "notes",
+    "rx_or_scaled", "pr",
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+def import_csv(path):
+    params = fitness_mcp.ImportSugarWODInput(file_path=path)
+    return asyncio.run(fitness_mcp.fitness_import_sugarwod(params))
+
+
+def counts(result):
+    return {
+        key: int(re.search(rf"\*\*{key}.*?:\*\* (\d+)", result).group(1))
+        for key in ("Imported", "Skipped", "Lift PRs recorded")
+    }
+
+
+def test_reimport_skips_every_row(tmp_path):
+    path = write_csv(tmp_path / "export.csv", [
+        ["01/06/2024", "Reimport Squat", "", "Load", "300", "300",
+         "Reimport Squat", "", "", "RX", "PR"],
+        # Not MM/DD/YYYY, so stored as-is, and as an INTEGER by the
+        # DATE column's numeric affinity
+        ["20240106", "Reimport Fran", "", "Time", "245", "4:05",
+         "", "", "", "RX", ""],
+    ])
+
+    first = import_csv(path)
+    second = import_csv(path)
+
+    assert counts(first) == {"Imported": 2, "Skipped": 0, "Lift PRs recorded": 1}
+    assert counts(second) == {"Imported": 0, "Skipped": 2, "Lift PRs recorded": 0}
+    assert "Errors" not in second
+
+
+def test_malformed_rows_are_reported_not_raised(tmp_path):
+    path = tmp_path / "export.csv"
+    write_csv(path, [
+        ["01/07/2024", "Malformed Short", "3x5"],
+        ["01/07/2024", "Malformed Huge", "x" * (csv.field_size_limit() + 1)],
+        ["01/07/2024", "Malformed Rejected", "", "Time", "60", "1:00",
+         "", "", "", "RX", ""],
+        ["01/07/2024", "Malformed Fine", "", "Time", "60", "1:00",
+         "", "", "", "RX", ""],
+    ])
+    with open(path, "ab") as f:
+        f.write(b"01/07/2024,Malformed Latin-1 \xe9,,Time,60,1:00,,,,RX,\n")
+
+    # A row SQLite refuses must fail alone, not take the import with it
+    with fitness_mcp.get_db() as conn:
+        conn.execute("""
+            CREATE TRIGGER reject_row BEFORE INSERT ON workouts
+            WHEN new.title = 'Malformed Rejected'
+            BEGIN SELECT RAISE(ABORT, 'rejected'); END
+        """)
+    try:
+        result = import_csv(str(path))
+    finally:
+        with fitness_mcp.get_db() as conn:
+            conn.execute("DROP TRIGGER IF EXISTS reject_row")
+
+    assert counts(result)["Imported"] == 3
+    assert "### Errors (2)" in result
+    assert "field larger than field limit" in result
+    assert "rejected" in result
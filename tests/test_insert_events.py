@@ -0,0 +1,107 @@
+"""insert_events() against a fake Calendar service (no network)."""
+
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+httplib2 = pytest.importorskip("httplib2")
+errors = pytest.importorskip("googleapiclient.errors")
+
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "fitness.db"))
+
+import fitness_mcp  # noqa: E402
+
+
+def http_error(status, reason=None):
+    body = {"error": {"errors": [{"reason": reason}]}} if reason else {}
+    return errors.HttpError(httplib2.Response({"status": status}), json.dumps(body).encode())
+
+
+class FakeRequest:
+    def __init__(self, kind, body):
+        self.kind = kind
+        self.body = body
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            self.service.calls.append(request.kind)
+            error = self.service.respond(request)
+            self.callback(request_id, None if error else {}, error)
+
+
+class FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def insert(self, calendarId, body, **kwargs):
+        return FakeRequest("insert", body)
+
+    def update(self, calendarId, eventId, body, **kwargs):
+        return FakeRequest("update", body)
+
+
+class FakeService:
+    """Calendar whose answer to each request comes from respond(request)."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def events(self):
+        return FakeEvents(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    async def sleep(delay):
+        pass
+    monkeypatch.setattr(fitness_mcp.asyncio, "sleep", sleep)
+
+
+def test_existing_id_is_updated():
+    existing = {"a"}
+
+    def respond(request):
+        if request.kind == "insert" and request.body["id"] in existing:
+            return http_error(409, "duplicate")
+        return None
+
+    service = FakeService(respond)
+    events = [{"id": "a"}, {"id": "b"}]
+    failures = asyncio.run(fitness_mcp.insert_events(service, "primary", events))
+
+    assert failures == []
+    assert service.calls == ["insert", "insert", "update"]
+
+
+def test_conflict_on_last_attempt_is_a_failure():
+    attempts = fitness_mcp.CALENDAR_MAX_ATTEMPTS
+
+    def respond(request):
+        # Rate-limited until the last attempt, which then hits a 409
+        if len(service.calls) < attempts:
+            return http_error(429)
+        return http_error(409, "duplicate")
+
+    service = FakeService(respond)
+    failures = asyncio.run(fitness_mcp.insert_events(service, "primary", [{"id": "a"}]))
+
+    assert service.calls == ["insert"] * attempts
+    assert len(failures) == 1
+    assert failures[0][1].resp.status == 409
@@ -0,0 +1,72 @@
+"""replace_db() while another thread is inside a get_db() block."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "fitness.db"))
+
+import fitness_mcp  # noqa: E402
+
+
+def snapshot():
+    """Copy the current DB next to the live one, as /restore's upload is."""
+    fd, path = tempfile.mkstemp(dir=os.path.dirname(fitness_mcp.DB_PATH), suffix=".db")
+    os.close(fd)
+    with fitness_mcp.get_db() as conn:
+        dest = sqlite3.connect(path)
+        conn.backup(dest)
+        dest.close()
+    return path
+
+
+def weights():
+    with fitness_mcp.get_db() as conn:
+        return {row["date"] for row in conn.execute("SELECT date FROM weight_log")}
+
+
+def test_restore_waits_for_a_write_in_progress():
+    with fitness_mcp.get_db() as conn:
+        conn.execute("INSERT OR REPLACE INTO weight_log (date, weight) VALUES ('2020-01-01', 180)")
+    backup = snapshot()
+
+    entered = threading.Event()
+    proceed = threading.Event()
+    errors = []
+
+    def write():
+        try:
+            with fitness_mcp.get_db() as conn:
+                conn.execute("INSERT OR REPLACE INTO weight_log (date, weight) VALUES ('2020-01-02', 181)")
+                entered.set()
+                proceed.wait(5)
+                conn.execute("UPDATE weight_log SET notes = 'after' WHERE date = '2020-01-02'")
+        except Exception as e:
+            errors.append(e)
+
+    def restore():
+        try:
+            fitness_mcp.replace_db(backup)
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    assert entered.wait(5)
+    restorer = threading.Thread(target=restore)
+    restorer.start()
+
+    # The restore holds off until the write's block is done with the pool
+    restorer.join(0.2)
+    assert restorer.is_alive()
+    proceed.set()
+    writer.join(5)
+    restorer.join(5)
+
+    assert errors == []
+    assert not os.path.exists(backup)
+    # The backup predates the overlapping write, so only its row is left
+    fitness_mcp.init_db()
+    assert "2020-01-01" in weights()
+    assert "2020-01-02" not in weights()